@@ -1,36 +1,171 @@
 import sqlite3
-from sqlalchemy import create_engine
+import threading
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import StaticPool
 import os
 
 # Database configuration
 DATABASE_URL = "sqlite:///./fire_data.db"
+READ_DATABASE_URL = "sqlite:///file:./fire_data.db?mode=ro&uri=true"
 EXISTING_DB_PATH = "../testing/fire_data.db"  # Path to your existing database
+COPY_BATCH_SIZE = 10_000
 
-# Create engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Read-only connections kept open, plus extra ones allowed under bursts
+READ_POOL_SIZE = 20
+READ_POOL_OVERFLOW = 10
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Single-column indexes superseded by the composite indexes on the models
+OBSOLETE_INDEXES = (
+    "ix_fire_detections_latitude",
+    "ix_fire_detections_longitude",
+    "ix_fire_detections_acq_date",
+    "ix_fire_detections_source",
+    "ix_fire_detections_state",
+    "ix_user_reported_fires_state",
+    "ix_fire_src_dt",
+    "ix_fire_state_dt",
+)
+
+# Backfills for fire_detections columns derived from the stored acquisition
+# time and source, for rows written before the columns existed
+DERIVED_COLUMN_BACKFILLS = {
+    "acq_epoch": "UPDATE fire_detections SET acq_epoch = CAST(strftime('%s', acq_datetime) AS INTEGER) WHERE acq_epoch IS NULL",
+    "source_id": (
+        "UPDATE fire_detections SET source_id = CASE source "
+        "WHEN 'MODIS' THEN 1 WHEN 'VIIRS' THEN 2 WHEN 'User Reported' THEN 4 ELSE 0 END "
+        "WHERE source_id IS NULL"
+    ),
+}
+
+# SQLite tuning applied to every new connection: WAL lets readers run while
+# ingestion writes, and synchronous=NORMAL is durable enough in WAL mode
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Read-only connections cannot change the journal, so they only get cache tuning
+SQLITE_READ_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+)
+
+# Create write engine; all writes go through one shared connection
+write_engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+    pool_pre_ping=True,
+    pool_recycle=3600
+)
+engine = write_engine
+
+# In-memory databases have no journal to tune
+IS_MEMORY_DATABASE = engine.url.database in (None, "", ":memory:")
+
+# Serializes writers on the shared write connection; readers never take it
+write_lock = threading.Lock()
+
+def _apply_pragmas(pragmas):
+    def apply(dbapi_connection, connection_record):
+        """Apply PRAGMAs to a new DBAPI connection"""
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+    return apply
+
+if IS_MEMORY_DATABASE:
+    # A private in-memory database cannot be reopened read-only
+    read_engine = write_engine
+else:
+    event.listen(write_engine, "connect", _apply_pragmas(SQLITE_PRAGMAS))
+    
+    # Create read engine; WAL lets these connections read while a write is in progress.
+    # The pool is sized above the default 5 + 10 so concurrent /detect and
+    # /statistics requests on the worker threads don't queue for a connection
+    read_engine = create_engine(
+        READ_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=READ_POOL_SIZE,
+        max_overflow=READ_POOL_OVERFLOW,
+        pool_timeout=30,
+        pool_pre_ping=True,
+        pool_recycle=1800
+    )
+    event.listen(read_engine, "connect", _apply_pragmas(SQLITE_READ_PRAGMAS))
+
+# Create thread-scoped session registries
+SessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=write_engine))
+ReadSessionLocal = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=read_engine))
 
 # Create Base class
 Base = declarative_base()
 
-def get_database():
-    """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+class SessionManager:
+    """Context manager that holds a session only for the enclosed block"""
+    
+    def __init__(self, read_only: bool = False):
+        self.read_only = read_only
+        self.registry = ReadSessionLocal if read_only else SessionLocal
+    
+    def __enter__(self):
+        if not self.read_only:
+            write_lock.acquire()
+        self.db = self.registry()
+        return self.db
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is not None:
+                self.db.rollback()
+            self.registry.remove()
+        finally:
+            if not self.read_only:
+                write_lock.release()
+        return False
 
 def init_database():
     """Initialize database and create tables"""
-    from app.models.fire import Base
+    # Import every model module so all tables are registered on the shared Base
+    from app.models import fire, prediction
     Base.metadata.create_all(bind=engine)
+    
+    # create_all skips existing tables, so bring their indexes up to date
+    # and refresh planner statistics so the composite indexes get used
+    with write_lock, engine.begin() as conn:
+        # Add and backfill the integer acquisition time on older databases
+        columns = [row[1] for row in conn.execute(text("PRAGMA table_info(fire_detections)"))]
+        if "acq_epoch" not in columns:
+            conn.execute(text("ALTER TABLE fire_detections ADD COLUMN acq_epoch INTEGER"))
+            conn.execute(text(DERIVED_COLUMN_BACKFILLS["acq_epoch"]))
+        
+        # Add and backfill the SourceMask flag for each stored source
+        if "source_id" not in columns:
+            conn.execute(text("ALTER TABLE fire_detections ADD COLUMN source_id INTEGER"))
+            conn.execute(text(DERIVED_COLUMN_BACKFILLS["source_id"]))
+        
+        for index_name in OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+        conn.execute(text("ANALYZE"))
     print("Database initialized successfully")
 
+def optimize_database():
+    """Let SQLite refresh query planner statistics for changed tables"""
+    with engine.connect() as conn:
+        conn.execute(text("PRAGMA optimize"))
+
 def copy_existing_data():
     """Copy data from existing fire_data.db if it exists"""
     if os.path.exists(EXISTING_DB_PATH):
@@ -39,37 +174,80 @@ def copy_existing_data():
             existing_conn = sqlite3.connect(EXISTING_DB_PATH)
             existing_cursor = existing_conn.cursor()
             
-            # Connect to new database
-            new_conn = sqlite3.connect("./fire_data.db")
+            # Connect to new database; transactions are managed explicitly below
+            new_conn = sqlite3.connect("./fire_data.db", isolation_level=None)
             new_cursor = new_conn.cursor()
             
+            # Trade durability for speed for the duration of the import only
+            new_cursor.execute("PRAGMA synchronous=OFF")
+            new_cursor.execute("PRAGMA journal_mode=MEMORY")
+            new_cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+            
             # Get existing data
-            existing_cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+            existing_cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';")
             tables = existing_cursor.fetchall()
             
-            for table in tables:
-                table_name = table[0]
-                print(f"Copying data from table: {table_name}")
+            try:
+                new_cursor.execute("BEGIN")
                 
-                # Get data from existing table
-                existing_cursor.execute(f"SELECT * FROM {table_name}")
-                rows = existing_cursor.fetchall()
-                
-                # Get column info
-                existing_cursor.execute(f"PRAGMA table_info({table_name})")
-                columns = existing_cursor.fetchall()
-                column_names = [col[1] for col in columns]
-                
-                if rows:
+                for table in tables:
+                    table_name = table[0]
+                    
+                    # Copy only the columns both schemas share, by name, so columns
+                    # added since the old database was written don't shift values
+                    existing_columns = [col[1] for col in existing_conn.execute(f"PRAGMA table_info({table_name})")]
+                    new_columns = {col[1] for col in new_conn.execute(f"PRAGMA table_info({table_name})")}
+                    column_names = [name for name in existing_columns if name in new_columns]
+                    if not column_names:
+                        print(f"Skipping table not in the new schema: {table_name}")
+                        continue
+                    print(f"Copying data from table: {table_name}")
+                    
+                    column_list = ','.join(column_names)
                     placeholders = ','.join(['?' for _ in range(len(column_names))])
-                    new_cursor.execute(f"INSERT OR REPLACE INTO {table_name} VALUES ({placeholders})", rows[0])
+                    insert_sql = f"INSERT OR REPLACE INTO {table_name} ({column_list}) VALUES ({placeholders})"
+                    
+                    # Drop secondary indexes so they are built once after the copy
+                    # rather than updated row by row; autoindexes have no SQL
+                    indexes = new_conn.execute(
+                        "SELECT name, sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL",
+                        (table_name,)
+                    ).fetchall()
+                    for index_name, _ in indexes:
+                        new_cursor.execute(f"DROP INDEX {index_name}")
+                    
+                    # Stream data from existing table in bounded batches
+                    existing_cursor.execute(f"SELECT {column_list} FROM {table_name}")
+                    while True:
+                        batch = existing_cursor.fetchmany(COPY_BATCH_SIZE)
+                        if not batch:
+                            break
+                        new_cursor.executemany(insert_sql, batch)
+                    
+                    # Fill derived columns the old database didn't have
+                    if table_name == "fire_detections":
+                        for column, backfill_sql in DERIVED_COLUMN_BACKFILLS.items():
+                            if column in new_columns and column not in existing_columns:
+                                new_cursor.execute(backfill_sql)
+                    
+                    for _, index_sql in indexes:
+                        new_cursor.execute(index_sql)
+                
+                new_cursor.execute("COMMIT")
+            except Exception:
+                new_cursor.execute("ROLLBACK")
+                raise
+            finally:
+                # Restore the normal journaling used by the app engines
+                new_cursor.execute("PRAGMA locking_mode=NORMAL")
+                new_cursor.execute("PRAGMA journal_mode=WAL")
+                new_cursor.execute("PRAGMA synchronous=NORMAL")
+                existing_conn.close()
+                new_conn.close()
             
-            new_conn.commit()
-            existing_conn.close()
-            new_conn.close()
             print("Existing data copied successfully")
             
         except Exception as e:
             print(f"Error copying existing data: {e}")
     else:
-        print("No existing database found to copy from")
\ No newline at end of file
+        print("No existing database found to copy from")
@@ -1,22 +1,65 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
 import logging
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-from app.database.connection import init_database
+import anyio.to_thread
+import orjson
+
+from app.database.connection import init_database, optimize_database, IS_MEMORY_DATABASE
 from app.routers import fire, predictions, chat
+from app.services.fire_service import FireService
+from app.services.claude_service import PREDICTION_REFRESH_SECONDS
+from app.utils.http import StaticJSON
+
+class JSONLogFormatter(logging.Formatter):
+    """Render each log record as one line of JSON"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging once for the whole app
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(JSONLogFormatter())
+logging.basicConfig(level=logging.INFO, handlers=[log_handler])
 logger = logging.getLogger(__name__)
 
+# How often SQLite refreshes its query planner statistics
+OPTIMIZE_INTERVAL_SECONDS = 15 * 60
+
+# Worker threads for sync handlers and asyncio.to_thread calls, sized so
+# bursts of concurrent database requests don't queue behind each other
+THREADPOOL_SIZE = 200
+
+# Short max-age so load balancer probes still reach the process regularly
+HEALTH_JSON = StaticJSON({
+    "status": "healthy",
+    "service": "stubble-burning-detection-api",
+    "version": "1.0.0"
+}, max_age=5)
+
 # Create FastAPI app
 app = FastAPI(
     title="Stubble Burning Detection API",
     description="API for detecting and tracking stubble burning fires in Northern India",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -24,10 +67,14 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],  # Frontend URLs
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
+# Compress JSON bodies; fire and prediction lists repeat the same keys per row
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(fire.router)
 app.include_router(predictions.router)
@@ -36,6 +83,20 @@ app.include_router(chat.router)
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    app.state.executor = ThreadPoolExecutor(max_workers=THREADPOOL_SIZE)
+    asyncio.get_running_loop().set_default_executor(app.state.executor)
+    
+    # Share one warm historical service between FireService and the routers
+    app.state.historical_service = FireService.historical_service
+    
+    # CPU-bound prediction work runs in separate processes; spawn avoids
+    # forking a process that already has database and worker threads
+    app.state.process_pool = ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+    
     try:
         logger.info("Initializing database...")
         init_database()
@@ -43,6 +104,59 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
         raise
+    
+    # Typed columns, triggers and indexes on the historical fires database
+    try:
+        claude_service = chat.get_claude_service()
+        claude_service.ml_executor = app.state.process_pool
+        await asyncio.to_thread(claude_service.migrate_schema)
+    except Exception as e:
+        logger.error(f"Error migrating historical fire database: {e}")
+    
+    if not IS_MEMORY_DATABASE:
+        app.state.optimize_task = asyncio.create_task(optimize_database_periodically())
+    
+    # Keep ML predictions generated ahead of requests
+    app.state.prediction_task = asyncio.create_task(refresh_predictions_periodically())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background maintenance tasks"""
+    for task_name in ("optimize_task", "prediction_task"):
+        task = getattr(app.state, task_name, None)
+        if task:
+            task.cancel()
+    
+    executor = getattr(app.state, "executor", None)
+    if executor:
+        executor.shutdown(wait=False)
+    
+    process_pool = getattr(app.state, "process_pool", None)
+    if process_pool:
+        process_pool.shutdown(wait=False, cancel_futures=True)
+    
+    # Close the chat service's database connections if it was ever created
+    if chat.get_claude_service.cache_info().currsize:
+        chat.get_claude_service().close()
+
+async def optimize_database_periodically():
+    """Run PRAGMA optimize in the background every OPTIMIZE_INTERVAL_SECONDS"""
+    while True:
+        await asyncio.sleep(OPTIMIZE_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(optimize_database)
+        except Exception as e:
+            logger.error(f"Error optimizing database: {e}")
+
+async def refresh_predictions_periodically():
+    """Regenerate the chat service's ML predictions now and every PREDICTION_REFRESH_SECONDS"""
+    while True:
+        try:
+            # Generation is CPU-bound, so it runs in the process pool
+            await chat.get_claude_service().refresh_ml_predictions()
+        except Exception as e:
+            logger.error(f"Error refreshing ML predictions: {e}")
+        await asyncio.sleep(PREDICTION_REFRESH_SECONDS)
 
 @app.get("/")
 async def root():
@@ -56,13 +170,9 @@ async def root():
     }
 
 @app.get("/health")
-async def health_check():
+def health_check(request: Request):
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "service": "stubble-burning-detection-api",
-        "version": "1.0.0"
-    }
+    return HEALTH_JSON.response(request)
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -70,5 +180,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop="auto",
+        http="httptools",
         log_level="info"
     )
\ No newline at end of file
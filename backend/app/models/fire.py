@@ -1,30 +1,61 @@
-from sqlalchemy import Column, Integer, Float, String, DateTime, Boolean
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, Integer, Float, String, DateTime, Boolean, Index, CheckConstraint
 from sqlalchemy.sql import func
-from pydantic import BaseModel
+from pydantic import BaseModel, field_serializer, field_validator, model_validator
 from datetime import datetime
-from typing import Optional, List
+from enum import IntFlag
+from typing import Literal, Optional, List
 
-Base = declarative_base()
+from app.database.connection import Base
+
+class SourceMask(IntFlag):
+    """Bit flags for the detection sources enabled in a request"""
+    MODIS = 1
+    VIIRS = 2
+    USER = 4
+    
+    @classmethod
+    def from_names(cls, sources: dict) -> "SourceMask":
+        """Build a mask from the legacy {"MODIS": true, ...} mapping"""
+        mask = cls(0)
+        for name, enabled in sources.items():
+            if enabled and name in SOURCE_IDS:
+                mask |= SOURCE_IDS[name]
+        return mask
+
+# Stored source names and the flag each one maps to
+SOURCE_IDS = {
+    "MODIS": SourceMask.MODIS,
+    "VIIRS": SourceMask.VIIRS,
+    "User Reported": SourceMask.USER,
+}
 
 class FireDetection(Base):
     __tablename__ = "fire_detections"
+    __table_args__ = (
+        # Composite indexes matching the detect/statistics filter combinations
+        Index("ix_fire_src_epoch", "source", "acq_epoch"),
+        Index("ix_fire_state_epoch", "state", "acq_epoch"),
+        Index("ix_fire_bbox", "latitude", "longitude"),
+        CheckConstraint("confidence BETWEEN 0 AND 100", name="ck_fire_confidence_range"),
+    )
     
     id = Column(String, primary_key=True, index=True)
-    latitude = Column(Float, nullable=False, index=True)
-    longitude = Column(Float, nullable=False, index=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
     brightness = Column(Float, nullable=False)
     confidence = Column(Integer, nullable=False)
-    acq_date = Column(String, nullable=False, index=True)
+    acq_date = Column(String, nullable=False)
     acq_time = Column(String, nullable=False)
     acq_datetime = Column(DateTime, nullable=False, index=True)
-    source = Column(String, nullable=False, index=True)  # MODIS, VIIRS, User Reported
+    acq_epoch = Column(Integer, nullable=False, index=True)  # UTC seconds, for numeric range scans
+    source = Column(String, nullable=False)  # MODIS, VIIRS, User Reported
+    source_id = Column(Integer, index=True)  # SourceMask flag for source
     frp = Column(Float, nullable=True)  # Fire Radiative Power
     scan = Column(Float, nullable=True)
     track = Column(Float, nullable=True)
     
     # Additional fields for region identification
-    state = Column(String, nullable=True, index=True)
+    state = Column(String, nullable=True)
     district = Column(String, nullable=True)
     
     # Metadata
@@ -33,6 +64,9 @@ class FireDetection(Base):
 
 class UserReportedFire(Base):
     __tablename__ = "user_reported_fires"
+    __table_args__ = (
+        Index("ix_user_fire_state_reported", "state", "reported_at"),
+    )
     
     id = Column(String, primary_key=True, index=True)
     latitude = Column(Float, nullable=False, index=True)
@@ -46,7 +80,7 @@ class UserReportedFire(Base):
     
     # Location details
     location_name = Column(String, nullable=True)
-    state = Column(String, nullable=True, index=True)
+    state = Column(String, nullable=True)
     district = Column(String, nullable=True)
     
     # Fire details
@@ -88,17 +122,33 @@ class FireDetectionResponse(FireDetectionBase):
     
     class Config:
         from_attributes = True
+    
+    @field_serializer("brightness", "frp", "scan", "track")
+    def _round_measurement(self, value: Optional[float]) -> Optional[float]:
+        # Sensor values carry about two decimals of real precision
+        return round(value, 2) if value is not None else None
 
 class FireFilterRequest(BaseModel):
     region: str = "all-northern-india"
-    date_range: str = "24hr"  # "24hr", "7day", "custom"
+    date_range: Literal["24hr", "7day", "custom"] = "24hr"
     custom_start_date: Optional[str] = None
     custom_end_date: Optional[str] = None
-    sources: dict = {
-        "MODIS": True,
-        "VIIRS": True,
-        "User Reported": False
-    }
+    sources: int = SourceMask.MODIS | SourceMask.VIIRS  # SourceMask bits
+    
+    @field_validator("sources", mode="before")
+    @classmethod
+    def _coerce_sources(cls, value):
+        # Clients may still send the source-name mapping
+        if isinstance(value, dict):
+            return int(SourceMask.from_names(value))
+        return value
+    
+    @model_validator(mode="after")
+    def _require_custom_dates(self) -> "FireFilterRequest":
+        # Reject incomplete custom ranges at parse time with a 422
+        if self.date_range == "custom" and not (self.custom_start_date and self.custom_end_date):
+            raise ValueError("Custom date range requires both start and end dates")
+        return self
 
 class FireFilterResponse(BaseModel):
     fires: List[FireDetectionResponse]
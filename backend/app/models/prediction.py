@@ -1,13 +1,17 @@
-from sqlalchemy import Column, String, Float, Integer, DateTime, Text, JSON
-from sqlalchemy.ext.declarative import declarative_base
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+from sqlalchemy import Column, String, Float, Integer, DateTime, Text, JSON, Index, text
+from pydantic import BaseModel, model_validator
+from typing import List, Literal, Optional, Dict
 from datetime import datetime
 
-Base = declarative_base()
+from app.database.connection import Base
 
 class FirePrediction(Base):
     __tablename__ = "fire_predictions"
+    __table_args__ = (
+        # Top-N by probability and risk level filters
+        Index("ix_pred_probability", text("probability DESC")),
+        Index("ix_pred_risk", "risk_level"),
+    )
     
     id = Column(String, primary_key=True)
     latitude = Column(Float, nullable=False)
@@ -27,13 +31,20 @@ class FirePrediction(Base):
 # Pydantic models for API
 class PredictionRequest(BaseModel):
     region: str = "all-northern-india"
-    date_range: str = "next-7days"  # next-7days, next-14days, next-30days, custom
+    date_range: Literal["next-7days", "next-14days", "next-30days", "custom"] = "next-7days"
     custom_start_date: Optional[str] = None
     custom_end_date: Optional[str] = None
     confidence_level: float = 70.0  # Minimum confidence threshold
     include_weather: bool = True
     include_crop_pattern: bool = True
     include_historical: bool = True
+    
+    @model_validator(mode="after")
+    def _require_custom_dates(self) -> "PredictionRequest":
+        # Reject incomplete custom ranges at parse time with a 422
+        if self.date_range == "custom" and not (self.custom_start_date and self.custom_end_date):
+            raise ValueError("Custom date range requires both start and end dates")
+        return self
 
 class PredictionData(BaseModel):
     id: str
@@ -1,25 +1,65 @@
-from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import Response
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse, ORJSONResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, TypeAdapter
 from typing import List, Dict, Any, Optional
+from cachetools import TTLCache, cached
+from functools import lru_cache
+import asyncio
 import logging
+import os
+import threading
 
-from app.services.claude_service import ClaudeService
+from app.services.claude_service import ClaudeService, PDF_TABLE_ROWS, build_prediction_pdf
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once in main.py
 logger = logging.getLogger(__name__)
 
-# Initialize Claude service
-claude_service = ClaudeService()
+@lru_cache
+def get_claude_service() -> ClaudeService:
+    """Create the Claude service on first use rather than at import"""
+    claude_service = ClaudeService()
+    # Cached top predictions go stale whenever the ML predictions are regenerated
+    claude_service.on_ml_update = invalidate_prediction_caches
+    return claude_service
+
+# Top-N lists are polled by dashboards; the lock covers lookups made from
+# worker threads. The summaries themselves are cached by ClaudeService.
+summary_cache = TTLCache(maxsize=64, ttl=60)
+summary_lock = threading.RLock()
+
+def invalidate_prediction_caches():
+    """Drop cached top predictions after new ML predictions are stored"""
+    with summary_lock:
+        for key in [key for key in summary_cache if key[0] == "top-predictions"]:
+            summary_cache.pop(key, None)
+
+@cached(summary_cache, key=lambda claude_service, limit, min_power: ("top-fires", limit, min_power), lock=summary_lock)
+def _cached_top_fires(claude_service: ClaudeService, limit: int, min_power: float) -> List[Dict[str, Any]]:
+    criteria = {"limit": limit}
+    if min_power > 0:
+        criteria["min_power"] = min_power
+    return claude_service.get_fires_by_criteria(criteria)
+
+@cached(summary_cache, key=lambda claude_service, limit, min_probability, risk_level: ("top-predictions", limit, min_probability, risk_level), lock=summary_lock)
+def _cached_top_predictions(claude_service: ClaudeService, limit: int, min_probability: float, risk_level: Optional[str]) -> List[Dict[str, Any]]:
+    criteria = {"limit": limit}
+    if min_probability > 0:
+        criteria["min_probability"] = min_probability
+    if risk_level:
+        criteria["risk_level"] = risk_level
+    return claude_service.get_predictions_by_criteria(criteria)
 
 class ChatMessage(BaseModel):
     role: str  # "user" or "assistant"
     content: str
     timestamp: Optional[str] = None
 
+# Dumps a whole conversation in one pydantic-core call
+_HISTORY_ADAPTER = TypeAdapter(List[ChatMessage])
+
 class ChatRequest(BaseModel):
     message: str
     conversation_history: Optional[List[ChatMessage]] = []
@@ -40,21 +80,21 @@ class PredictionReportRequest(BaseModel):
     risk_level: Optional[str] = None
 
 @router.post("/message", response_model=ChatResponse)
-async def send_chat_message(chat_request: ChatRequest):
+async def send_chat_message(
+    chat_request: ChatRequest,
+    claude_service: ClaudeService = Depends(get_claude_service)
+):
     """
     Send a message to the AI assistant and get a response
     """
     try:
-        logger.info(f"Received chat message: {chat_request.message[:100]}...")
+        logger.info("Received chat message: %.100s...", chat_request.message)
         
         # Convert ChatMessage objects to dictionaries for Claude service
-        history = []
-        if chat_request.conversation_history:
-            for msg in chat_request.conversation_history:
-                history.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
+        history = _HISTORY_ADAPTER.dump_python(
+            chat_request.conversation_history or [],
+            include={"__all__": {"role", "content"}}
+        )
         
         # Get response from Claude
         response = await claude_service.chat_with_claude(
@@ -62,7 +102,7 @@ async def send_chat_message(chat_request: ChatRequest):
             conversation_history=history
         )
         
-        logger.info(f"Generated response: {response[:100]}...")
+        logger.info("Generated response: %.100s...", response)
         
         return ChatResponse(response=response)
         
@@ -74,14 +114,18 @@ async def send_chat_message(chat_request: ChatRequest):
         )
 
 @router.post("/generate-report")
-async def generate_fire_report(report_request: ReportRequest):
+async def generate_fire_report(
+    report_request: ReportRequest,
+    claude_service: ClaudeService = Depends(get_claude_service)
+):
     """
     Generate a fire report for authorities
     """
     try:
-        logger.info(f"Generating fire report: {report_request.report_type}")
+        logger.info("Generating fire report: %s", report_request.report_type)
         
-        report = claude_service.generate_fire_report(
+        report = await asyncio.to_thread(
+            claude_service.generate_fire_report,
             fire_id=report_request.fire_id,
             criteria=report_request.criteria
         )
@@ -96,13 +140,13 @@ async def generate_fire_report(report_request: ReportRequest):
         )
 
 @router.get("/fire-summary")
-async def get_fire_summary():
+async def get_fire_summary(claude_service: ClaudeService = Depends(get_claude_service)):
     """
     Get a summary of fire data
     """
     try:
-        summary = claude_service.get_fire_data_summary()
-        return summary
+        summary = await asyncio.to_thread(claude_service.get_fire_data_summary)
+        return ORJSONResponse(content=summary)
         
     except Exception as e:
         logger.error(f"Error getting fire summary: {str(e)}")
@@ -112,17 +156,17 @@ async def get_fire_summary():
         )
 
 @router.get("/top-fires")
-async def get_top_fires(limit: int = 5, min_power: float = 0):
+async def get_top_fires(
+    limit: int = 5,
+    min_power: float = 0,
+    claude_service: ClaudeService = Depends(get_claude_service)
+):
     """
     Get top fires by power
     """
     try:
-        criteria = {"limit": limit}
-        if min_power > 0:
-            criteria["min_power"] = min_power
-            
-        fires = claude_service.get_fires_by_criteria(criteria)
-        return {"fires": fires, "count": len(fires)}
+        fires = await asyncio.to_thread(_cached_top_fires, claude_service, limit, min_power)
+        return ORJSONResponse(content={"fires": fires, "count": len(fires)})
         
     except Exception as e:
         logger.error(f"Error getting top fires: {str(e)}")
@@ -132,12 +176,16 @@ async def get_top_fires(limit: int = 5, min_power: float = 0):
         )
 
 @router.post("/generate-prediction-report")
-async def generate_prediction_pdf_report(report_request: PredictionReportRequest):
+async def generate_prediction_pdf_report(
+    report_request: PredictionReportRequest,
+    request: Request,
+    claude_service: ClaudeService = Depends(get_claude_service)
+):
     """
     Generate a PDF report for predicted fires for authorities
     """
     try:
-        logger.info(f"Generating prediction PDF report")
+        logger.info("Generating prediction PDF report")
         
         # Build criteria from request
         criteria = report_request.criteria or {}
@@ -147,26 +195,30 @@ async def generate_prediction_pdf_report(report_request: PredictionReportRequest
             criteria['risk_level'] = report_request.risk_level
         
         if report_request.format == "pdf":
-            # Generate PDF report
-            pdf_bytes = claude_service.generate_prediction_pdf_report(criteria)
-            
-            if not pdf_bytes:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Failed to generate PDF report"
-                )
+            # Gather the data on a worker thread, then lay out the PDF in the
+            # process pool so ReportLab's CPU work doesn't contend for the GIL.
+            # The worker writes to a temporary file, which is streamed from
+            # disk and removed once sent
+            summary, predictions = await asyncio.to_thread(claude_service.prepare_prediction_report, criteria)
+            pdf_path = await asyncio.get_running_loop().run_in_executor(
+                request.app.state.process_pool,
+                build_prediction_pdf,
+                summary,
+                predictions[:PDF_TABLE_ROWS]
+            )
             
-            return Response(
-                content=pdf_bytes,
+            return FileResponse(
+                pdf_path,
                 media_type="application/pdf",
                 headers={
                     "Content-Disposition": "attachment; filename=fire_prediction_report.pdf"
-                }
+                },
+                background=BackgroundTask(os.remove, pdf_path)
             )
         else:
             # Generate text report (fallback)
-            predictions = claude_service.get_predictions_by_criteria(criteria)
-            summary = claude_service.get_prediction_data_summary()
+            predictions = await asyncio.to_thread(claude_service.get_predictions_by_criteria, criteria)
+            summary = await asyncio.to_thread(claude_service.get_prediction_data_summary)
             
             return {
                 "report_type": "prediction_summary",
@@ -183,12 +235,12 @@ async def generate_prediction_pdf_report(report_request: PredictionReportRequest
         )
 
 @router.get("/prediction-summary")
-async def get_prediction_summary():
+async def get_prediction_summary(claude_service: ClaudeService = Depends(get_claude_service)):
     """
     Get a summary of prediction data
     """
     try:
-        summary = claude_service.get_prediction_data_summary()
+        summary = await asyncio.to_thread(claude_service.get_prediction_data_summary)
         return summary
         
     except Exception as e:
@@ -199,18 +251,17 @@ async def get_prediction_summary():
         )
 
 @router.get("/top-predictions")
-async def get_top_predictions(limit: int = 5, min_probability: float = 0, risk_level: str = None):
+async def get_top_predictions(
+    limit: int = 5,
+    min_probability: float = 0,
+    risk_level: str = None,
+    claude_service: ClaudeService = Depends(get_claude_service)
+):
     """
     Get top predictions by probability
     """
     try:
-        criteria = {"limit": limit}
-        if min_probability > 0:
-            criteria["min_probability"] = min_probability
-        if risk_level:
-            criteria["risk_level"] = risk_level
-            
-        predictions = claude_service.get_predictions_by_criteria(criteria)
+        predictions = await asyncio.to_thread(_cached_top_predictions, claude_service, limit, min_probability, risk_level)
         return {"predictions": predictions, "count": len(predictions)}
         
     except Exception as e:
@@ -221,14 +272,16 @@ async def get_top_predictions(limit: int = 5, min_probability: float = 0, risk_l
         )
 
 @router.get("/health")
-async def chat_health_check():
+async def chat_health_check(claude_service: ClaudeService = Depends(get_claude_service)):
     """
     Health check for chat service
     """
     try:
         # Test Claude service
-        summary = claude_service.get_fire_data_summary()
-        prediction_summary = claude_service.get_prediction_data_summary()
+        summary, prediction_summary = await asyncio.gather(
+            asyncio.to_thread(claude_service.get_fire_data_summary),
+            asyncio.to_thread(claude_service.get_prediction_data_summary)
+        )
         
         return {
             "status": "healthy",
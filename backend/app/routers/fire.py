@@ -1,13 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import TypeAdapter
+from cachetools import TTLCache, cached
+from typing import List, Optional
+import asyncio
 import logging
+import orjson
+import threading
+import time
 
-from app.database.connection import get_database
-from app.models.fire import FireFilterRequest, FireFilterResponse, FireDetectionResponse, UserReportedFireCreate, UserReportedFireResponse
-from app.services.fire_service import FireService
+from app.database.connection import SessionManager
+from app.models.fire import SourceMask, FireFilterRequest, FireFilterResponse, FireDetectionResponse, UserReportedFireCreate, UserReportedFireResponse
+from app.services.fire_service import FireService, RECENT_WINDOWS
 from app.services.historical_fire_service import HistoricalFireService
 from app.utils.regions import get_available_regions
+from app.utils.http import StaticJSON
 from pydantic import BaseModel
 
 class VerifyReportRequest(BaseModel):
@@ -15,15 +22,131 @@ class VerifyReportRequest(BaseModel):
 
 router = APIRouter(prefix="/api/fires", tags=["fires"])
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once in main.py
 logger = logging.getLogger(__name__)
 
-@router.post("/detect", response_model=FireFilterResponse)
-async def detect_fires(
-    filter_request: FireFilterRequest,
-    db: Session = Depends(get_database)
-):
+# Built once so a whole report list is dumped in a single pydantic-core call
+REPORT_LIST_ADAPTER = TypeAdapter(List[UserReportedFireResponse])
+
+# The region list is static, so serialize it once at import
+REGIONS = get_available_regions()
+REGIONS_JSON = StaticJSON({
+    "regions": REGIONS,
+    "total_regions": len(REGIONS)
+})
+
+HEALTH_JSON = StaticJSON({
+    "status": "healthy",
+    "service": "fire-detection-api",
+    "version": "1.0.0"
+}, max_age=5)
+
+# The historical table only changes on re-import; refresh its date range hourly
+date_range_cache = TTLCache(maxsize=1, ttl=3600)
+
+@cached(date_range_cache, key=lambda historical_service: ("date-range",))
+def _cached_date_range(historical_service: HistoricalFireService):
+    return historical_service.get_available_date_range()
+
+def get_historical_service(request: Request) -> HistoricalFireService:
+    """Dependency returning the process-wide historical fire service"""
+    return request.app.state.historical_service
+
+# Detection results keyed on the full filter; recent data goes stale faster
+# than the 7-day and historical windows. User report writes clear them all.
+recent_fires_cache = TTLCache(maxsize=256, ttl=30)
+history_fires_cache = TTLCache(maxsize=256, ttl=600)
+statistics_cache = TTLCache(maxsize=256, ttl=60)
+fires_cache_lock = threading.Lock()
+
+def _fires_cache_for(date_range: str) -> TTLCache:
+    return recent_fires_cache if date_range == "24hr" else history_fires_cache
+
+def _invalidate_fire_caches():
+    """Drop cached detections after user reports change"""
+    with fires_cache_lock:
+        recent_fires_cache.clear()
+        history_fires_cache.clear()
+        statistics_cache.clear()
+
+# Database work runs on worker threads so the event loop never waits on SQLite;
+# each call opens its own thread-scoped session
+
+def _find_fires(region: str, date_range: str, sources: int,
+                custom_start_date: Optional[str] = None, custom_end_date: Optional[str] = None):
+    """Get fires and their statistics using a read-only session"""
+    with SessionManager(read_only=True) as db:
+        fire_service = FireService.for_session(db)
+        
+        # Get fires based on filters
+        fires = fire_service.get_fires_by_filters(
+            region=region,
+            date_range=date_range,
+            custom_start_date=custom_start_date,
+            custom_end_date=custom_end_date,
+            sources=sources
+        )
+        
+        # Calculate statistics
+        return fires, fire_service.get_fire_statistics(fires)
+
+def _find_fire_columns(region: str, date_range: str, sources: int,
+                       custom_start_date: Optional[str] = None, custom_end_date: Optional[str] = None):
+    """Get fires as per-field arrays and their statistics using a read-only session"""
+    with SessionManager(read_only=True) as db:
+        columns = FireService.for_session(db).get_fires_as_columns(
+            region=region,
+            date_range=date_range,
+            custom_start_date=custom_start_date,
+            custom_end_date=custom_end_date,
+            sources=sources
+        )
+        return columns, FireService.get_column_statistics(columns)
+
+def _load_recent_fires(region: str, date_range: str, sources: int, end_epoch: Optional[int] = None) -> List[FireDetectionResponse]:
+    """Read already-ingested recent fires using a read-only session"""
+    with SessionManager(read_only=True) as db:
+        return FireService.for_session(db).get_fires_by_filters(
+            region=region,
+            date_range=date_range,
+            sources=sources,
+            ingest=False,
+            end_epoch=end_epoch
+        )
+
+def _fire_statistics(region: str, date_range: str, sources: int, ingest: bool = True,
+                     end_epoch: Optional[int] = None) -> dict:
+    """Aggregate fire statistics in SQL using a read-only session"""
+    with SessionManager(read_only=True) as db:
+        return FireService.for_session(db).get_fire_statistics_sql(region, date_range, sources, ingest, end_epoch)
+
+def _create_report(report: UserReportedFireCreate) -> UserReportedFireResponse:
+    """Store a user report using the writer session"""
+    with SessionManager() as db:
+        reported_fire = FireService.for_session(db).create_user_report(report)
+    _invalidate_fire_caches()
+    return reported_fire
+
+def _list_reports(region: str, status_filter: str, limit: int) -> List[UserReportedFireResponse]:
+    """Get user reports using a read-only session"""
+    with SessionManager(read_only=True) as db:
+        return FireService.for_session(db).get_user_reports(
+            region=region,
+            status_filter=status_filter,
+            limit=limit
+        )
+
+def _verify_report(report_id: str, verified_by: str) -> Optional[UserReportedFireResponse]:
+    """Mark a user report verified using the writer session"""
+    with SessionManager() as db:
+        updated_report = FireService.for_session(db).verify_user_report(report_id, verified_by)
+    _invalidate_fire_caches()
+    return updated_report
+
+# List endpoints serialize once through pydantic-core and hand the result to
+# orjson; the declared models only document the response schema
+@router.post("/detect", response_model=None, responses={200: {"model": FireFilterResponse}})
+async def detect_fires(filter_request: FireFilterRequest):
     """
     Detect fires based on filters
     
@@ -31,46 +154,64 @@ async def detect_fires(
     - **date_range**: Time range for fire detection ("24hr", "7day", "custom")
     - **custom_start_date**: Start date for custom range (YYYY-MM-DD)
     - **custom_end_date**: End date for custom range (YYYY-MM-DD)
-    - **sources**: Dictionary of enabled data sources
+    - **sources**: SourceMask bits of enabled data sources (MODIS=1, VIIRS=2, User Reported=4)
     """
     try:
-        logger.info(f"Fire detection request: {filter_request}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Fire detection request: %s", filter_request)
         
-        # Validate custom date range
-        if filter_request.date_range == "custom":
-            if not filter_request.custom_start_date or not filter_request.custom_end_date:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Custom date range requires both start and end dates"
-                )
-        
-        # Initialize fire service
-        fire_service = FireService(db)
-        
-        # Get fires based on filters
-        fires = fire_service.get_fires_by_filters(
-            region=filter_request.region,
-            date_range=filter_request.date_range,
-            custom_start_date=filter_request.custom_start_date,
-            custom_end_date=filter_request.custom_end_date,
-            sources=filter_request.sources
+        cache = _fires_cache_for(filter_request.date_range)
+        cache_key = (
+            filter_request.region,
+            filter_request.date_range,
+            int(filter_request.sources),
+            filter_request.custom_start_date,
+            filter_request.custom_end_date
         )
+        with fires_cache_lock:
+            cached_result = cache.get(cache_key)
         
-        # Calculate statistics
-        stats = fire_service.get_fire_statistics(fires)
+        if cached_result is None:
+            if filter_request.date_range in RECENT_WINDOWS:
+                # Refresh from the API once, then read the rows and the aggregate
+                # concurrently, each on its own read-only session, over one window
+                await asyncio.to_thread(
+                    FireService.ingest_recent_fires,
+                    filter_request.region,
+                    filter_request.date_range,
+                    filter_request.sources
+                )
+                end_epoch = int(time.time())
+                cached_result = await asyncio.gather(
+                    asyncio.to_thread(_load_recent_fires, filter_request.region, filter_request.date_range, filter_request.sources, end_epoch),
+                    asyncio.to_thread(_fire_statistics, filter_request.region, filter_request.date_range, filter_request.sources, False, end_epoch)
+                )
+            else:
+                cached_result = await asyncio.to_thread(
+                    _find_fires,
+                    filter_request.region,
+                    filter_request.date_range,
+                    filter_request.sources,
+                    filter_request.custom_start_date,
+                    filter_request.custom_end_date
+                )
+            with fires_cache_lock:
+                cache[cache_key] = cached_result
+        fires, stats = cached_result
         
-        logger.info(f"Found {len(fires)} fires for region {filter_request.region}")
+        logger.info("Found %d fires for region %s", len(fires), filter_request.region)
         
-        return FireFilterResponse(
+        # The service already returns validated FireDetectionResponse items,
+        # so construct the envelope without re-validating them
+        response = FireFilterResponse.model_construct(
             fires=fires,
             total_count=stats["total_fires"],
             filtered_count=len(fires),
             region=filter_request.region,
             date_range=filter_request.date_range
         )
+        return ORJSONResponse(content=response.model_dump(mode="json"))
         
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Error in fire detection: {str(e)}")
         raise HTTPException(
@@ -78,27 +219,65 @@ async def detect_fires(
             detail=f"Internal server error: {str(e)}"
         )
 
+@router.post("/detect/columns", response_model=None)
+async def detect_fires_columnar(filter_request: FireFilterRequest):
+    """
+    Detect fires, returning one array per field instead of one object per fire
+    
+    Takes the same filters as /detect. Missing fire radiative power is null.
+    """
+    try:
+        columns, stats = await asyncio.to_thread(
+            _find_fire_columns,
+            filter_request.region,
+            filter_request.date_range,
+            filter_request.sources,
+            filter_request.custom_start_date,
+            filter_request.custom_end_date
+        )
+        
+        logger.info("Found %d fires for region %s", stats["total_fires"], filter_request.region)
+        
+        # orjson writes the numpy arrays directly without boxing each value
+        body = orjson.dumps({
+            "columns": columns,
+            "statistics": stats,
+            "total_count": stats["total_fires"],
+            "filtered_count": stats["total_fires"],
+            "region": filter_request.region,
+            "date_range": filter_request.date_range
+        }, option=orjson.OPT_SERIALIZE_NUMPY)
+        return Response(content=body, media_type="application/json")
+        
+    except Exception as e:
+        logger.error(f"Error in columnar fire detection: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}"
+        )
+
 @router.get("/statistics")
 async def get_fire_statistics(
     region: str = "all-northern-india",
-    date_range: str = "24hr",
-    db: Session = Depends(get_database)
+    date_range: str = "24hr"
 ):
     """
     Get fire statistics for a region and date range
     """
     try:
-        fire_service = FireService(db)
-        
-        # Get fires for statistics
-        fires = fire_service.get_fires_by_filters(
-            region=region,
-            date_range=date_range,
-            sources={"MODIS": True, "VIIRS": True, "User Reported": True}
-        )
+        with fires_cache_lock:
+            stats = statistics_cache.get((region, date_range))
         
-        # Calculate and return statistics
-        stats = fire_service.get_fire_statistics(fires)
+        if stats is None:
+            # Aggregate statistics across every source
+            stats = await asyncio.to_thread(
+                _fire_statistics,
+                region,
+                date_range,
+                SourceMask.MODIS | SourceMask.VIIRS | SourceMask.USER
+            )
+            with fires_cache_lock:
+                statistics_cache[(region, date_range)] = stats
         
         return {
             "region": region,
@@ -114,31 +293,21 @@ async def get_fire_statistics(
         )
 
 @router.get("/regions")
-async def get_regions():
+def get_regions(request: Request):
     """
     Get available regions for fire detection
     """
-    try:
-        regions = get_available_regions()
-        return {
-            "regions": regions,
-            "total_regions": len(regions)
-        }
-    except Exception as e:
-        logger.error(f"Error getting regions: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error getting regions: {str(e)}"
-        )
+    return REGIONS_JSON.response(request)
 
 @router.get("/date-range")
-async def get_available_date_range():
+def get_available_date_range(
+    historical_service: HistoricalFireService = Depends(get_historical_service)
+):
     """
     Get available date range for historical fire data
     """
     try:
-        historical_service = HistoricalFireService()
-        date_range = historical_service.get_available_date_range()
+        date_range = _cached_date_range(historical_service)
         
         return {
             "available_range": date_range,
@@ -152,10 +321,7 @@ async def get_available_date_range():
         )
 
 @router.post("/report", response_model=UserReportedFireResponse)
-async def report_fire_incident(
-    report: UserReportedFireCreate,
-    db: Session = Depends(get_database)
-):
+async def report_fire_incident(report: UserReportedFireCreate):
     """
     Report a stubble burning incident
     
@@ -170,12 +336,11 @@ async def report_fire_incident(
     - **smoke_visibility**: Optional smoke visibility level
     """
     try:
-        logger.info(f"User fire report received: {report.latitude}, {report.longitude}")
+        logger.info("User fire report received: %s, %s", report.latitude, report.longitude)
         
-        fire_service = FireService(db)
-        reported_fire = fire_service.create_user_report(report)
+        reported_fire = await asyncio.to_thread(_create_report, report)
         
-        logger.info(f"User report created with ID: {reported_fire.id}")
+        logger.info("User report created with ID: %s", reported_fire.id)
         
         return reported_fire
         
@@ -186,12 +351,11 @@ async def report_fire_incident(
             detail=f"Error creating report: {str(e)}"
         )
 
-@router.get("/reports", response_model=List[UserReportedFireResponse])
+@router.get("/reports", response_model=None, responses={200: {"model": List[UserReportedFireResponse]}})
 async def get_user_reports(
     region: str = "all-northern-india",
     status_filter: str = "all",
-    limit: int = 100,
-    db: Session = Depends(get_database)
+    limit: int = 100
 ):
     """
     Get user-reported fire incidents
@@ -201,16 +365,11 @@ async def get_user_reports(
     - **limit**: Maximum number of reports to return
     """
     try:
-        fire_service = FireService(db)
-        reports = fire_service.get_user_reports(
-            region=region,
-            status_filter=status_filter,
-            limit=limit
-        )
+        reports = await asyncio.to_thread(_list_reports, region, status_filter, limit)
         
-        logger.info(f"Retrieved {len(reports)} user reports for region {region}")
+        logger.info("Retrieved %d user reports for region %s", len(reports), region)
         
-        return reports
+        return ORJSONResponse(content=REPORT_LIST_ADAPTER.dump_python(reports, mode="json"))
         
     except Exception as e:
         logger.error(f"Error getting user reports: {str(e)}")
@@ -222,15 +381,13 @@ async def get_user_reports(
 @router.put("/reports/{report_id}/verify")
 async def verify_report(
     report_id: str,
-    request: VerifyReportRequest,
-    db: Session = Depends(get_database)
+    request: VerifyReportRequest
 ):
     """
     Verify a user-reported incident (admin function)
     """
     try:
-        fire_service = FireService(db)
-        updated_report = fire_service.verify_user_report(report_id, request.verified_by)
+        updated_report = await asyncio.to_thread(_verify_report, report_id, request.verified_by)
         
         if not updated_report:
             raise HTTPException(
@@ -238,7 +395,7 @@ async def verify_report(
                 detail="Report not found"
             )
         
-        logger.info(f"Report {report_id} verified by {request.verified_by}")
+        logger.info("Report %s verified by %s", report_id, request.verified_by)
         
         return updated_report
         
@@ -252,12 +409,8 @@ async def verify_report(
         )
 
 @router.get("/health")
-async def health_check():
+def health_check(request: Request):
     """
     Health check endpoint
     """
-    return {
-        "status": "healthy",
-        "service": "fire-detection-api",
-        "version": "1.0.0"
-    }
\ No newline at end of file
+    return HEALTH_JSON.response(request)
\ No newline at end of file
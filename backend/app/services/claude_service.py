@@ -1,67 +1,711 @@
 import os
 import json
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import asyncio
+from typing import List, Dict, Any, Optional, BinaryIO, Tuple, Callable
+from datetime import datetime, timedelta
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
+from cachetools import TTLCache
+import numpy as np
+import queue
+import re
 import sqlite3
-import pandas as pd
-from anthropic import Anthropic
+import tempfile
+import threading
+from anthropic import AsyncAnthropic
+import httpx
 from dotenv import load_dotenv
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from io import BytesIO
 
 # Load environment variables
 load_dotenv()
 
+# Connections shared by the worker threads that query the historical
+# database. Each one keeps its own page cache, so the pool stays small
+CONNECTION_POOL_SIZE = 4
+
+# Tuning applied to each pooled connection. The journal mode is left alone:
+# HistoricalFireService opens the same file with mode=ro, which WAL would
+# break wherever the -shm file can't be created
+CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=67108864",
+    "PRAGMA cache_size=-8192",
+    "PRAGMA busy_timeout=5000",
+)
+
+# The fires table stores every value as TEXT; these REAL copies let queries
+# compare and sort numbers without a per-row CAST. Empty strings become NULL.
+# Triggers keep the copies current for rows written after the migration
+FIRE_TYPED_COLUMNS = (
+    ("frp_r", "frp"),
+    ("brightness_r", "brightness"),
+    ("confidence_r", "confidence"),
+    ("lat_r", "latitude"),
+    ("lon_r", "longitude"),
+)
+FIRE_TYPED_ASSIGNMENTS = ", ".join(
+    f"{typed} = CAST(NULLIF(NEW.{source}, '') AS REAL)" for typed, source in FIRE_TYPED_COLUMNS
+)
+FIRE_TYPED_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS fires_typed_insert AFTER INSERT ON fires BEGIN "
+    f"UPDATE fires SET {FIRE_TYPED_ASSIGNMENTS} WHERE rowid = NEW.rowid; END",
+    "CREATE TRIGGER IF NOT EXISTS fires_typed_update AFTER UPDATE OF "
+    + ", ".join(source for _, source in FIRE_TYPED_COLUMNS)
+    + f" ON fires BEGIN UPDATE fires SET {FIRE_TYPED_ASSIGNMENTS} WHERE rowid = NEW.rowid; END",
+)
+
+# Indexes for the date filters and the top-N orderings. The frp index is
+# partial on the non-null filter the queries below use, and carries every
+# column they read, so the average and top-N never touch the table
+FIRE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_fires_acq_date ON fires(acq_date)",
+    "DROP INDEX IF EXISTS ix_fires_frp",
+    "DROP INDEX IF EXISTS ix_fires_frp_covering",
+    "CREATE INDEX IF NOT EXISTS ix_fires_frp_r ON fires(frp_r DESC, latitude, longitude, "
+    "brightness_r, confidence, acq_date, acq_time) WHERE frp_r IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS ix_fires_bbox ON fires(lat_r, lon_r, frp_r DESC)",
+)
+PREDICTION_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS ix_pred_probability ON fire_predictions(probability DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_pred_risk ON fire_predictions(risk_level)",
+)
+
+# Summaries only change when the fire data is re-imported, but chat reads
+# both of them on every turn
+SUMMARY_TTL_SECONDS = 30
+
+# How often the background task regenerates the ML predictions served when
+# there is no fire_predictions table
+PREDICTION_REFRESH_SECONDS = 10 * 60
+
+# Connections kept open to the Claude API between chat turns
+CLAUDE_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+try:
+    import h2
+    CLAUDE_HTTP2 = True
+except ImportError:
+    CLAUDE_HTTP2 = False
+
+# Region named in a chat message, by keyword; the first listed wins when a
+# message names several
+REGION_KEYWORDS = {
+    "punjab": "punjab",
+    "haryana": "haryana",
+    "uttar pradesh": "uttar-pradesh",
+    "up": "uttar-pradesh",
+    "delhi": "delhi",
+    "rajasthan": "rajasthan",
+    "himachal": "himachal-pradesh",
+    "uttarakhand": "uttarakhand",
+}
+
+# Prediction sets generated ahead of requests: every known region over a week
+ML_PREDICTION_KEYS = (("all-northern-india", 7),) + tuple((region, 7) for region in dict.fromkeys(REGION_KEYWORDS.values()))
+
+# Intent and region keywords in a chat turn, found in one scan. The lookahead
+# also reports overlapping matches, so membership in the result matches a
+# substring test ("predict" covers "prediction")
+INTENT_KEYWORDS = ("report", "predict", "authorities", "top", "highest", "summary", "statistics", "fire")
+INTENT_PATTERN = re.compile(
+    "(?=(" + "|".join(re.escape(keyword) for keyword in INTENT_KEYWORDS + tuple(REGION_KEYWORDS)) + "))"
+)
+
+# Chat system prompt; only the six summary figures change between turns
+SYSTEM_PROMPT_TEMPLATE = """You are an AI assistant for a fire detection and prediction system. You have access to databases of both historical fire detections and future fire predictions.
+
+CURRENT FIRE DETECTION DATA:
+- Total fires detected: {total_fires}
+- Recent fires (7 days): {recent_fires}
+- Average fire power: {average_power} MW
+
+CURRENT PREDICTION DATA:
+- Total predictions: {total_predictions}
+- High-risk predictions: {high_risk_predictions}
+- Average prediction probability: {average_probability}%
+
+You can help users with:
+1. Generating PDF reports for authorities about predicted fires (priority feature)
+2. Analyzing prediction data and fire risk summaries
+3. Finding top predictions by probability, risk level, or location
+4. Calculating statistics about fire predictions and detection
+5. Providing recommendations for fire management and prevention
+6. Comparing historical fire data with future predictions
+
+Available tools:
+- get_prediction_summary: Get overall prediction statistics
+- get_top_predictions: Get highest probability predictions
+- generate_prediction_report: Create official PDF reports for authorities
+- search_predictions: Find predictions by criteria (probability, risk level, region, date)
+- get_fire_summary: Get overall fire detection statistics
+- generate_fire_report: Create reports for detected fires
+
+IMPORTANT: When users ask for "report" or "generate report", prioritize creating prediction reports using ML data and provide PDF downloads for authorities.
+
+Be helpful, accurate, and provide actionable information for fire management and prediction.
+
+IMPORTANT: Keep responses concise and under 300 tokens. Be helpful but brief."""
+
+# Canned chat answers, filled in with str.format; rows are joined rather
+# than appended one piece at a time
+TOP_PREDICTIONS_HEADER = "Here are the top 5 highest probability fire predictions for {region}:\n\n"
+TOP_PREDICTION_ROW = (
+    "{rank}. Prediction ID: {id}...\n"
+    "   🔥 Probability: {probability:.1f}%\n"
+    "   ⚠️ Risk Level: {risk_level}\n"
+    "   📍 Location: {latitude:.4f}, {longitude:.4f}\n"
+    "   📅 Predicted Date: {predicted_date}\n"
+    "   🗺️ Region: {region}\n"
+    "{factors}\n"
+)
+TOP_PREDICTION_FACTORS = "   🔍 Risk Factors: {factors}\n"
+TOP_PREDICTIONS_NOTE = "**Note:** Predictions generated using ML analysis of historical patterns, weather data, and crop cycles for {region} region."
+TOP_PREDICTIONS_PENDING = (
+    "Generating new fire risk predictions using machine learning models...\n\n"
+    "**Analysis includes:**\n"
+    "• Historical fire pattern analysis\n"
+    "• Weather and environmental data\n"
+    "• Agricultural practice monitoring\n"
+    "• Seasonal risk assessment\n\n"
+    "Please try again in a moment as the system generates fresh predictions."
+)
+TOP_FIRES_HEADER = "Here are the top 5 highest power fires:\n\n"
+TOP_FIRE_ROW = (
+    "{rank}. Fire Location: {latitude:.4f}, {longitude:.4f}\n"
+    "   Power: {frp:.1f} MW\n"
+    "   Brightness: {brightness:.1f}K\n"
+    "   Date: {acq_date} at {acq_time}\n\n"
+)
+RISK_BREAKDOWN_ROW = "• {risk_level}: {count} predictions\n"
+SUMMARY_PREDICTION_ROW = "{rank}. {probability:.1f}% risk at ({latitude:.4f}, {longitude:.4f}) - {risk_level} level"
+SUMMARY_FIRE_ROW = "{rank}. {frp:.1f} MW at ({latitude:.4f}, {longitude:.4f}) on {acq_date}"
+PREDICTION_SUMMARY_TEMPLATE = """Fire Prediction Summary:
+
+🎯 **Prediction Statistics:**
+- Total predictions generated: {total_predictions}
+- High-risk predictions: {high_risk_predictions}
+- Average prediction probability: {average_probability}%
+
+📊 **Risk Level Distribution:**
+{risk_breakdown}
+
+🔥 **Top 3 Highest Probability Predictions:**
+{top_predictions}
+
+The system uses ML analysis to predict fire risks and can generate comprehensive PDF reports for authorities."""
+FIRE_SUMMARY_TEMPLATE = """Fire Detection Summary:
+
+📊 **Detection Statistics:**
+- Total fires detected: {total_fires}
+- Recent fires (last 7 days): {recent_fires}
+- Average fire power: {average_power} MW
+
+🔥 **Top 3 Highest Power Fires:**
+{top_fires}
+
+The system is actively monitoring fire activity and can generate detailed reports for authorities when needed."""
+
+# Fire power (MW) above which a fire moves up to the next severity label
+SEVERITY_FRP_THRESHOLDS = (20, 50)
+SEVERITY_LABELS = (
+    "MEDIUM - Standard monitoring",
+    "HIGH - Monitor closely",
+    "CRITICAL - Immediate action required",
+)
+
+# High-power fires listed in the text situation report
+REPORT_TOP_FIRES = 5
+
+# Prediction rows listed in the PDF report table, and the fields each row shows
+PDF_TABLE_ROWS = 10
+PDF_ROW_FIELDS = itemgetter('id', 'latitude', 'longitude', 'probability', 'risk_level', 'predicted_date', 'region')
+
+# Closing recommendations printed at the end of every prediction PDF
+PDF_RECOMMENDATIONS = (
+    "Deploy monitoring resources to high-probability locations immediately",
+    "Coordinate with local fire departments in identified regions",
+    "Prepare fire suppression equipment in critical risk areas",
+    "Issue public advisories for high-risk zones and dates",
+    "Monitor weather conditions that may escalate fire risks",
+    "Establish communication channels with agricultural communities",
+    "Review emergency response protocols for predicted timeframes",
+    "Consider temporary restrictions on burning activities in high-risk areas",
+)
+
+# Fires acquired within this many days count as recent in the summary
+RECENT_FIRE_DAYS = 7
+
+# Summary queries, kept as fixed text so each connection's statement cache
+# reuses the prepared plans. The recent count, the average and the top 5 are
+# subqueries so each is answered from its own index; SQLite builds the top 5
+# as one JSON array
+FIRE_SUMMARY_SQL = """
+SELECT COUNT(*),
+       (SELECT COUNT(*) FROM fires WHERE acq_date >= ?),
+       (SELECT AVG(frp_r) FROM fires WHERE frp_r IS NOT NULL),
+       (SELECT json_group_array(json_object(
+                   'latitude', latitude, 'longitude', longitude, 'frp', frp,
+                   'brightness', brightness, 'confidence', confidence,
+                   'acq_date', acq_date, 'acq_time', acq_time))
+        FROM (SELECT latitude, longitude, frp_r as frp, 
+                     brightness_r as brightness, confidence, acq_date, acq_time 
+              FROM fires 
+              WHERE frp_r IS NOT NULL
+              ORDER BY frp_r DESC 
+              LIMIT 5))
+FROM fires
+"""
+PREDICTION_SUMMARY_SQL = """
+SELECT (SELECT json_group_array(json_array(risk_level, count, probability_total, percentage))
+        FROM (SELECT risk_level, COUNT(*) AS count, SUM(probability) AS probability_total,
+                     ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 1) AS percentage
+              FROM fire_predictions 
+              GROUP BY risk_level)),
+       (SELECT json_group_array(json_object(
+                   'id', id, 'latitude', latitude, 'longitude', longitude,
+                   'probability', probability, 'risk_level', risk_level,
+                   'predicted_date', predicted_date, 'confidence', confidence,
+                   'region', region))
+        FROM (SELECT id, latitude, longitude, probability, risk_level, predicted_date, confidence, region 
+              FROM fire_predictions 
+              ORDER BY probability DESC 
+              LIMIT 5))
+"""
+
+# Field accessors for generated predictions. They are PredictionData dumps,
+# so every field is present and no .get() default is needed
+PREDICTION_PROBABILITY = itemgetter('probability')
+PREDICTION_RISK_LEVEL = itemgetter('risk_level')
+PREDICTION_REGION = itemgetter('region')
+
+# Criteria queries: a fixed base plus one clause per filter present, in this order
+FIRE_CRITERIA_BASE = (
+    "SELECT latitude, longitude, frp_r as frp, brightness_r as brightness, "
+    "confidence, acq_date, acq_time FROM fires WHERE frp_r IS NOT NULL"
+)
+FIRE_CRITERIA_CLAUSES = {
+    'min_power': " AND frp_r >= ?",
+    'min_confidence': " AND confidence_r >= ?",
+    'date_from': " AND acq_date >= ?",
+    'region_bounds': " AND lat_r BETWEEN ? AND ? AND lon_r BETWEEN ? AND ?",
+}
+
+# Boxes smaller than this (square degrees) are answered from ix_fires_bbox.
+# Wider boxes hold enough fires that walking ix_fires_frp_r finds the top N
+# sooner, so their clause uses unary + to keep the planner off the bbox index
+BBOX_INDEX_MAX_AREA = 1.0
+WIDE_REGION_CLAUSE = " AND +lat_r BETWEEN ? AND ? AND +lon_r BETWEEN ? AND ?"
+PREDICTION_CRITERIA_BASE = "SELECT * FROM fire_predictions WHERE 1=1"
+PREDICTION_CRITERIA_CLAUSES = {
+    'min_probability': " AND probability >= ?",
+    'risk_level': " AND risk_level = ?",
+    'region': " AND region = ?",
+    'date_from': " AND predicted_date >= ?",
+}
+
+@lru_cache(maxsize=None)
+def _fire_criteria_query(keys: tuple, wide_region: bool = False) -> str:
+    """Build the fire criteria SQL once per combination of filters"""
+    clauses = dict(FIRE_CRITERIA_CLAUSES, region_bounds=WIDE_REGION_CLAUSE) if wide_region else FIRE_CRITERIA_CLAUSES
+    return FIRE_CRITERIA_BASE + "".join(clauses[key] for key in keys) + " ORDER BY frp_r DESC LIMIT ?"
+
+@lru_cache(maxsize=None)
+def _prediction_criteria_query(keys: tuple) -> str:
+    """Build the prediction criteria SQL once per combination of filters"""
+    return PREDICTION_CRITERIA_BASE + "".join(PREDICTION_CRITERIA_CLAUSES[key] for key in keys) + " ORDER BY probability DESC LIMIT ?"
+
+def _fire_severity(frp: float) -> str:
+    """Severity label for a fire's power, looked up by bisecting the thresholds"""
+    return SEVERITY_LABELS[bisect_left(SEVERITY_FRP_THRESHOLDS, frp)]
+
+def _fetch_records(conn: sqlite3.Connection, query: str, params=()) -> List[Dict[str, Any]]:
+    """Run a query and return its rows as column-name dicts"""
+    cursor = conn.execute(query, params)
+    columns = [column[0] for column in cursor.description]
+    # Iterate the cursor so rows are converted as SQLite steps, without an
+    # intermediate list of tuples
+    return [dict(zip(columns, row)) for row in cursor]
+
+def _fetch_rows(conn: sqlite3.Connection, query: str, params=()) -> List[sqlite3.Row]:
+    """Run a query and return sqlite3.Row objects, for rows that never leave the service"""
+    cursor = conn.cursor()
+    # Set on the cursor so the shared connection keeps returning plain tuples
+    cursor.row_factory = sqlite3.Row
+    return cursor.execute(query, params).fetchall()
+
+def _probabilities(predictions: List[Dict[str, Any]]) -> np.ndarray:
+    """Probability of each prediction as a float array"""
+    return np.fromiter(map(PREDICTION_PROBABILITY, predictions), dtype=float, count=len(predictions))
+
+def _most_probable(predictions: List[Dict[str, Any]], probability: np.ndarray, candidates: np.ndarray, limit: int) -> List[Dict[str, Any]]:
+    """The `limit` most probable candidates, highest first"""
+    # Partially select the top `limit` before sorting just those
+    if len(candidates) > limit:
+        candidates = candidates[np.argpartition(-probability[candidates], limit - 1)[:limit]]
+    order = candidates[np.argsort(-probability[candidates], kind='stable')]
+    return [predictions[i] for i in order]
+
+def _filter_predictions(predictions: List[Dict[str, Any]], criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Apply the criteria filters to generated predictions and return the most probable"""
+    probability = _probabilities(predictions)
+    mask = np.ones(len(predictions), dtype=bool)
+    
+    if criteria.get('min_probability'):
+        mask &= probability >= criteria['min_probability']
+    
+    if criteria.get('risk_level'):
+        mask &= np.array(list(map(PREDICTION_RISK_LEVEL, predictions)), dtype=object) == criteria['risk_level']
+    
+    if criteria.get('region') and criteria['region'] != 'all-northern-india':
+        mask &= np.array(list(map(PREDICTION_REGION, predictions)), dtype=object) == criteria['region']
+    
+    return _most_probable(predictions, probability, np.flatnonzero(mask), criteria.get('limit', 10))
+
+def _summarize_predictions(predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize generated predictions; risk rows already carry their percentage"""
+    total_predictions = len(predictions)
+    risk_counts = Counter(map(PREDICTION_RISK_LEVEL, predictions))
+    probability = _probabilities(predictions)
+    
+    return {
+        "total_predictions": total_predictions,
+        "high_risk_predictions": risk_counts['high'] + risk_counts['critical'],
+        "top_predictions": _most_probable(predictions, probability, np.arange(total_predictions), 5),
+        "average_probability": round(float(probability.mean()), 2) if total_predictions else 0,
+        "risk_distribution": [
+            {'risk_level': k, 'count': v, 'percentage': round(v * 100 / total_predictions, 1)}
+            for k, v in risk_counts.items()
+        ]
+    }
+
+@lru_cache(maxsize=1)
+def _pdf_styles():
+    """Build the report's paragraph and table styles once per process"""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        spaceAfter=30,
+        textColor=colors.darkred,
+        alignment=1  # Center alignment
+    )
+    risk_table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+    prediction_table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.darkred),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        # Color code risk levels
+        ('TEXTCOLOR', (3, 1), (3, -1), colors.darkred),
+    ])
+    return styles, title_style, risk_table_style, prediction_table_style
+
+@lru_cache(maxsize=1)
+def _pdf_closing_flowables() -> tuple:
+    """Build the fixed recommendations and footer paragraphs once per process"""
+    from reportlab.platypus import Paragraph, Spacer
+    
+    styles = _pdf_styles()[0]
+    content = [Paragraph("RECOMMENDATIONS FOR AUTHORITIES", styles['Heading2'])]
+    for i, rec in enumerate(PDF_RECOMMENDATIONS, 1):
+        content.append(Paragraph(f"{i}. {rec}", styles['Normal']))
+    
+    content.append(Spacer(1, 30))
+    
+    # Footer
+    content.append(Paragraph("This report is generated by the AI Fire Prediction System", styles['Normal']))
+    content.append(Paragraph("For emergency situations, contact local fire departments immediately", styles['Normal']))
+    content.append(Paragraph("Report generated using machine learning analysis of historical fire patterns", styles['Normal']))
+    return tuple(content)
+
+def write_prediction_pdf(output: BinaryIO, prediction_summary: Dict[str, Any], predictions: List[Dict[str, Any]]):
+    """Lay out the prediction PDF report on a file-like object"""
+    # ReportLab is only needed here, so chat-only processes never import it
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+    
+    # Create PDF directly on the output stream
+    doc = SimpleDocTemplate(output, pagesize=A4, topMargin=inch)
+    
+    # Get styles
+    styles, title_style, risk_table_style, prediction_table_style = _pdf_styles()
+    
+    # Build content
+    content = []
+    
+    # Title
+    content.append(Paragraph("FIRE RISK PREDICTION REPORT", title_style))
+    content.append(Paragraph("For Authorities and Emergency Services", styles['Heading2']))
+    content.append(Spacer(1, 20))
+    
+    # Report metadata
+    content.append(Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+    content.append(Paragraph(f"<b>Report Type:</b> Fire Risk Prediction Analysis", styles['Normal']))
+    content.append(Paragraph(f"<b>Coverage:</b> Northern India Region", styles['Normal']))
+    content.append(Spacer(1, 20))
+    
+    # Executive Summary
+    content.append(Paragraph("EXECUTIVE SUMMARY", styles['Heading2']))
+    content.append(Paragraph(f"• Total predictions generated: <b>{prediction_summary['total_predictions']}</b>", styles['Normal']))
+    content.append(Paragraph(f"• High-risk locations identified: <b>{prediction_summary['high_risk_predictions']}</b>", styles['Normal']))
+    content.append(Paragraph(f"• Average fire probability: <b>{prediction_summary['average_probability']}%</b>", styles['Normal']))
+    content.append(Spacer(1, 20))
+    
+    # Risk Level Distribution
+    if prediction_summary.get('risk_distribution'):
+        content.append(Paragraph("RISK LEVEL DISTRIBUTION", styles['Heading2']))
+        risk_data = [['Risk Level', 'Count', 'Percentage']] + [
+            [risk['risk_level'].title(), str(risk['count']), f"{risk['percentage']}%"]
+            for risk in prediction_summary['risk_distribution']
+        ]
+        
+        risk_table = Table(risk_data)
+        risk_table.setStyle(risk_table_style)
+        content.append(risk_table)
+        content.append(Spacer(1, 20))
+    
+    # Top High-Risk Predictions
+    content.append(Paragraph("TOP HIGH-RISK PREDICTIONS", styles['Heading2']))
+    
+    if predictions:
+        # Predictions are PredictionData dumps, so every field is present
+        pred_data = [['ID', 'Location', 'Probability', 'Risk Level', 'Predicted Date', 'Region']] + [
+            [
+                pred_id[:8] + '...',  # Truncate ID
+                f"{latitude:.3f}, {longitude:.3f}",
+                f"{probability:.1f}%",
+                risk_level.title(),
+                predicted_date,
+                region.replace('-', ' ').title()
+            ]
+            for pred_id, latitude, longitude, probability, risk_level, predicted_date, region
+            in map(PDF_ROW_FIELDS, predictions[:PDF_TABLE_ROWS])
+        ]
+        
+        pred_table = Table(pred_data, colWidths=[1*inch, 1.5*inch, 0.8*inch, 0.8*inch, 1*inch, 1.2*inch])
+        pred_table.setStyle(prediction_table_style)
+        content.append(pred_table)
+    else:
+        content.append(Paragraph("No high-risk predictions found.", styles['Normal']))
+    
+    content.append(Spacer(1, 20))
+    
+    # Recommendations and footer are the same in every report
+    content.extend(_pdf_closing_flowables())
+    
+    # Build PDF
+    doc.build(content)
+
+def generate_ml_predictions(region: str = "all-northern-india", days: int = 7) -> List[Dict[str, Any]]:
+    """Generate predictions with the ML prediction service; safe to run in a worker process"""
+    try:
+        from app.services.simple_prediction_service import SimplePredictionService
+        
+        # Create prediction service directly
+        prediction_service = SimplePredictionService()
+        
+        # Generate predictions
+        predictions = prediction_service.generate_predictions(
+            region=region,
+            date_range=f"next-{days}days",
+            confidence_threshold=60.0
+        )
+        
+        # Convert to dict format
+        return [pred.dict() for pred in predictions] if predictions else []
+            
+    except Exception as e:
+        print(f"Error generating ML predictions: {e}")
+        return []
+
+def build_prediction_pdf(prediction_summary: Dict[str, Any], predictions: List[Dict[str, Any]]) -> str:
+    """Render the prediction PDF to a temporary file and return its path; module
+    level so a process pool can run it. The caller deletes the file."""
+    with tempfile.NamedTemporaryFile(prefix="fire_prediction_", suffix=".pdf", delete=False) as output:
+        try:
+            write_prediction_pdf(output, prediction_summary, predictions)
+        except Exception:
+            output.close()
+            os.remove(output.name)
+            raise
+    return output.name
+
 class ClaudeService:
     def __init__(self):
-        self.client = Anthropic(api_key=os.getenv("CLAUDE_API_KEY"))
+        # Async client so chat turns don't block the event loop; its HTTP
+        # connections stay open and are reused across turns
+        self.client = AsyncAnthropic(
+            api_key=os.getenv("CLAUDE_API_KEY"),
+            http_client=httpx.AsyncClient(limits=CLAUDE_HTTP_LIMITS, http2=CLAUDE_HTTP2)
+        )
         self.db_path = "/Users/siddharthgianchandani/final-encode-hack/fire_data.db"
+        # Free slots hold None until a connection is first opened for them
+        self._pool = queue.LifoQueue()
+        for _ in range(CONNECTION_POOL_SIZE):
+            self._pool.put(None)
+        self._summary_cache = TTLCache(maxsize=8, ttl=SUMMARY_TTL_SECONDS)
+        self._summary_lock = threading.Lock()
+        # Last generated predictions per (region, days); the dict is replaced
+        # whole under _ml_lock, so readers never see it change mid-lookup
+        self._ml_predictions = {}
+        self._ml_pending = {}
+        self._ml_lock = threading.Lock()
+        # Process pool the predictions are generated in, set by the app at startup
+        self.ml_executor = None
+        # Called whenever new predictions are stored
+        self.on_ml_update: Optional[Callable[[], None]] = None
+        # Canned chat answers, tried in order against the keywords found in a turn
+        self._intent_handlers = (
+            (lambda intents: "report" in intents, self._handle_report),
+            (lambda intents: "top" in intents and "predict" in intents, self._handle_top_predictions),
+            (lambda intents: "top" in intents and "fire" in intents, self._handle_top_fires),
+            (lambda intents: ("summary" in intents or "statistics" in intents) and "predict" in intents, self._handle_prediction_summary),
+            (lambda intents: "summary" in intents or "statistics" in intents, self._handle_fire_summary),
+        )
+    
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled SQLite connection, waiting for one if all are in use"""
+        conn = self._pool.get()
+        try:
+            if conn is None:
+                conn = self._open_connection()
+            yield conn
+        finally:
+            self._pool.put(conn)
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and tune a connection for the pool"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None, cached_statements=256, check_same_thread=False)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def close(self):
+        """Close the pooled connections; called on application shutdown"""
+        for _ in range(CONNECTION_POOL_SIZE):
+            conn = self._pool.get()
+            if conn is not None:
+                conn.close()
+            self._pool.put(None)
+    
+    def migrate_schema(self):
+        """Add the typed columns, their triggers and the query indexes; run once at startup"""
+        with self._connection() as conn:
+            # Undo the WAL mode earlier versions left on the file
+            conn.execute("PRAGMA journal_mode=DELETE")
+            self._ensure_typed_columns(conn)
+            self._ensure_indexes(conn)
+    
+    def _ensure_typed_columns(self, conn: sqlite3.Connection):
+        """Add the REAL fire columns and triggers if missing, and fill rows written before them"""
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(fires)")}
+            if not columns:
+                return
+            conn.execute("BEGIN")
+            try:
+                for typed, source in FIRE_TYPED_COLUMNS:
+                    if typed not in columns:
+                        conn.execute(f"ALTER TABLE fires ADD COLUMN {typed} REAL")
+                for trigger in FIRE_TYPED_TRIGGERS:
+                    conn.execute(trigger)
+                assignments = ", ".join(f"{typed} = CAST(NULLIF({source}, '') AS REAL)" for typed, source in FIRE_TYPED_COLUMNS)
+                # Latitude is always present, so a NULL lat_r marks an unconverted row
+                conn.execute(f"UPDATE fires SET {assignments} WHERE lat_r IS NULL")
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            print(f"Error adding typed fire columns: {e}")
+    
+    def _ensure_indexes(self, conn: sqlite3.Connection):
+        """Create the query indexes once, refreshing planner statistics if any were added"""
+        try:
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+            indexes = (FIRE_INDEXES if "fires" in tables else ()) + (PREDICTION_INDEXES if "fire_predictions" in tables else ())
+            before = self._index_names(conn)
+            for statement in indexes:
+                conn.execute(statement)
+            if self._index_names(conn) != before:
+                conn.execute("ANALYZE")
+        except sqlite3.Error as e:
+            # A read-only copy of the database still works, just without the indexes
+            print(f"Error creating fire data indexes: {e}")
+    
+    @staticmethod
+    def _index_names(conn: sqlite3.Connection) -> set:
+        return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    
+    def _has_predictions_table(self) -> bool:
+        """Check whether the fire_predictions table exists"""
+        with self._connection() as conn:
+            return conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='fire_predictions'"
+            ).fetchone() is not None
         
+    def _cached_summary(self, key: str, load) -> Dict[str, Any]:
+        """Return a fresh cached summary, loading and caching it otherwise"""
+        with self._summary_lock:
+            summary = self._summary_cache.get(key)
+        if summary is None:
+            summary = load()
+            # Keep retrying failed summaries instead of serving the error
+            if "error" not in summary:
+                with self._summary_lock:
+                    self._summary_cache[key] = summary
+        return summary
+    
+    def invalidate_summary(self):
+        """Drop cached summaries after the underlying data changes"""
+        with self._summary_lock:
+            self._summary_cache.clear()
+    
     def get_fire_data_summary(self) -> Dict[str, Any]:
+        """Get a summary of fire data, cached for SUMMARY_TTL_SECONDS"""
+        return self._cached_summary("fire", self._load_fire_data_summary)
+    
+    def get_prediction_data_summary(self) -> Dict[str, Any]:
+        """Get a summary of prediction data, cached for SUMMARY_TTL_SECONDS"""
+        return self._cached_summary("prediction", self._load_prediction_data_summary)
+    
+    def _load_fire_data_summary(self) -> Dict[str, Any]:
         """Get a summary of fire data from the database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            
-            # Get total fire count
-            total_fires = pd.read_sql_query("SELECT COUNT(*) as count FROM fires", conn).iloc[0]['count']
-            
-            # Get recent fires (last 7 days) - using simple string comparison for dates
-            recent_query = """
-            SELECT COUNT(*) as count FROM fires 
-            WHERE acq_date >= '2025-06-15'
-            """
-            recent_fires = pd.read_sql_query(recent_query, conn).iloc[0]['count']
-            
-            # Get top 5 highest power fires - convert frp to float for ordering
-            top_fires_query = """
-            SELECT latitude, longitude, CAST(frp as REAL) as frp, 
-                   CAST(brightness as REAL) as brightness, confidence, acq_date, acq_time 
-            FROM fires 
-            WHERE frp != '' AND frp IS NOT NULL
-            ORDER BY CAST(frp as REAL) DESC 
-            LIMIT 5
-            """
-            top_fires = pd.read_sql_query(top_fires_query, conn)
-            
-            # Get average fire power
-            avg_power_query = """
-            SELECT AVG(CAST(frp as REAL)) as avg_power 
-            FROM fires 
-            WHERE frp != '' AND frp IS NOT NULL
-            """
-            avg_power_result = pd.read_sql_query(avg_power_query, conn)
-            avg_power = avg_power_result.iloc[0]['avg_power'] if not avg_power_result.empty else 0
-            
-            conn.close()
+            with self._connection() as conn:
+                # Total, recent, average power and the top 5 in one statement
+                cutoff = (datetime.now() - timedelta(days=RECENT_FIRE_DAYS)).strftime("%Y-%m-%d")
+                total_fires, recent_fires, avg_power, top_fires_json = conn.execute(FIRE_SUMMARY_SQL, (cutoff,)).fetchone()
             
             return {
                 "total_fires": int(total_fires),
                 "recent_fires": int(recent_fires),
-                "top_fires": top_fires.to_dict('records'),
+                "top_fires": json.loads(top_fires_json),
                 "average_power": round(float(avg_power), 2) if avg_power else 0
             }
             
@@ -77,40 +721,29 @@ class ClaudeService:
     
     def get_fires_by_criteria(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Get fires based on specific criteria"""
+        return [dict(row) for row in self._fire_rows(criteria)]
+    
+    def _fire_rows(self, criteria: Dict[str, Any]) -> List[sqlite3.Row]:
+        """Get fires based on specific criteria as sqlite3.Row objects"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            
-            query = """
-            SELECT latitude, longitude, CAST(frp as REAL) as frp, 
-                   CAST(brightness as REAL) as brightness, confidence, acq_date, acq_time 
-            FROM fires WHERE frp != '' AND frp IS NOT NULL
-            """
+            # Identical filter shapes reuse the same SQL text, so SQLite's
+            # statement cache skips re-parsing them
+            keys = tuple(key for key in FIRE_CRITERIA_CLAUSES if criteria.get(key))
             params = []
-            
-            if criteria.get('min_power'):
-                query += " AND CAST(frp as REAL) >= ?"
-                params.append(criteria['min_power'])
-                
-            if criteria.get('min_confidence'):
-                query += " AND CAST(confidence as REAL) >= ?"
-                params.append(criteria['min_confidence'])
-                
-            if criteria.get('date_from'):
-                query += " AND acq_date >= ?"
-                params.append(criteria['date_from'])
-                
-            if criteria.get('region_bounds'):
-                bounds = criteria['region_bounds']
-                query += " AND CAST(latitude as REAL) BETWEEN ? AND ? AND CAST(longitude as REAL) BETWEEN ? AND ?"
-                params.extend([bounds['min_lat'], bounds['max_lat'], bounds['min_lon'], bounds['max_lon']])
-            
-            query += " ORDER BY CAST(frp as REAL) DESC LIMIT ?"
+            wide_region = False
+            for key in keys:
+                if key == 'region_bounds':
+                    bounds = criteria['region_bounds']
+                    params.extend([bounds['min_lat'], bounds['max_lat'], bounds['min_lon'], bounds['max_lon']])
+                    area = (bounds['max_lat'] - bounds['min_lat']) * (bounds['max_lon'] - bounds['min_lon'])
+                    wide_region = area >= BBOX_INDEX_MAX_AREA
+                else:
+                    params.append(criteria[key])
             params.append(criteria.get('limit', 10))
+            query = _fire_criteria_query(keys, wide_region)
             
-            fires = pd.read_sql_query(query, conn, params=params)
-            conn.close()
-            
-            return fires.to_dict('records')
+            with self._connection() as conn:
+                return _fetch_rows(conn, query, params)
             
         except Exception as e:
             print(f"Error getting fires by criteria: {e}")
@@ -121,18 +754,13 @@ class ClaudeService:
         try:
             if fire_id:
                 # Get specific fire
-                conn = sqlite3.connect(self.db_path)
-                fire_data = pd.read_sql_query(
-                    "SELECT * FROM fires WHERE id = ?", 
-                    conn, 
-                    params=[fire_id]
-                )
-                conn.close()
+                with self._connection() as conn:
+                    fire_data = _fetch_rows(conn, "SELECT * FROM fires WHERE id = ?", [fire_id])
                 
-                if fire_data.empty:
+                if not fire_data:
                     return "Fire not found"
                     
-                fire = fire_data.iloc[0].to_dict()
+                fire = fire_data[0]
                 
                 report = f"""
 FIRE INCIDENT REPORT
@@ -147,7 +775,7 @@ Confidence: {fire['confidence']}%
 Source: {fire['source']}
 
 SEVERITY ASSESSMENT:
-{"CRITICAL - Immediate action required" if fire['frp'] > 50 else "HIGH - Monitor closely" if fire['frp'] > 20 else "MEDIUM - Standard monitoring"}
+{_fire_severity(fire['frp'])}
 
 RECOMMENDED ACTIONS:
 - Deploy fire suppression resources if available
@@ -159,7 +787,11 @@ RECOMMENDED ACTIONS:
             else:
                 # Generate summary report
                 summary = self.get_fire_data_summary()
-                fires = self.get_fires_by_criteria(criteria or {'limit': 10})
+                
+                # Only fetch as many fires as the report lists
+                report_criteria = dict(criteria or {})
+                report_criteria['limit'] = min(report_criteria.get('limit', REPORT_TOP_FIRES), REPORT_TOP_FIRES)
+                fires = self._fire_rows(report_criteria)
                 
                 report = f"""
 FIRE SITUATION REPORT
@@ -173,7 +805,7 @@ SUMMARY:
 
 TOP HIGH-POWER FIRES:
 """
-                for i, fire in enumerate(fires[:5], 1):
+                for i, fire in enumerate(fires, 1):
                     report += f"""
 {i}. Fire ID: {fire['id']}
    Location: {fire['latitude']:.4f}, {fire['longitude']:.4f}
@@ -195,66 +827,83 @@ RECOMMENDATIONS:
     
     def generate_predictions_with_ml(self, region: str = "all-northern-india", days: int = 7) -> List[Dict[str, Any]]:
         """Generate predictions using the ML prediction service directly"""
+        return generate_ml_predictions(region, days)
+
+    def cached_ml_predictions(self, region: str = "all-northern-india", days: int = 7) -> List[Dict[str, Any]]:
+        """Serve the last generated predictions; a set not generated yet is
+        scheduled in the background and served empty until it is ready"""
+        predictions = self._ml_predictions.get((region, days))
+        if predictions is None:
+            self._schedule_ml_predictions((region, days))
+            return []
+        return predictions
+    
+    def _schedule_ml_predictions(self, key: Tuple[str, int]):
+        """Start generating one prediction set unless it is ready or already in progress"""
+        executor = self.ml_executor
+        if executor is None:
+            # Outside the app there is no pool, so generate in the caller
+            self._store_ml_predictions({key: generate_ml_predictions(*key)})
+            return
+        with self._ml_lock:
+            if key in self._ml_predictions or key in self._ml_pending:
+                return
+            future = executor.submit(generate_ml_predictions, *key)
+            self._ml_pending[key] = future
+        future.add_done_callback(lambda future: self._finish_ml_predictions(key, future))
+    
+    def _finish_ml_predictions(self, key: Tuple[str, int], future):
+        """Store a prediction set generated by _schedule_ml_predictions"""
+        with self._ml_lock:
+            self._ml_pending.pop(key, None)
+        if future.cancelled():
+            return
         try:
-            from app.services.simple_prediction_service import SimplePredictionService
-            from app.models.prediction import PredictionRequest
-            
-            # Create prediction service directly
-            prediction_service = SimplePredictionService()
-            
-            # Generate predictions
-            predictions = prediction_service.generate_predictions(
-                region=region,
-                date_range=f"next-{days}days",
-                confidence_threshold=60.0
-            )
-            
-            # Convert to dict format
-            return [pred.dict() for pred in predictions] if predictions else []
-                
+            predictions = future.result()
         except Exception as e:
             print(f"Error generating ML predictions: {e}")
-            return []
+            return
+        self._store_ml_predictions({key: predictions})
+    
+    def _store_ml_predictions(self, predictions_by_key: Dict[Tuple[str, int], List[Dict[str, Any]]]):
+        """Publish newly generated prediction sets and drop summaries built from the old ones"""
+        predictions_by_key = {key: predictions for key, predictions in predictions_by_key.items() if predictions}
+        if not predictions_by_key:
+            return
+        with self._ml_lock:
+            self._ml_predictions = {**self._ml_predictions, **predictions_by_key}
+        self.invalidate_summary()
+        if self.on_ml_update:
+            self.on_ml_update()
+    
+    async def refresh_ml_predictions(self):
+        """Regenerate every known and previously requested prediction set in ml_executor"""
+        if self.ml_executor is None or await asyncio.to_thread(self._has_predictions_table):
+            return
+        loop = asyncio.get_running_loop()
+        keys = list(dict.fromkeys(ML_PREDICTION_KEYS + tuple(self._ml_predictions)))
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self.ml_executor, generate_ml_predictions, *key) for key in keys),
+            return_exceptions=True
+        )
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                print(f"Error generating ML predictions for {key}: {result}")
+        self._store_ml_predictions({key: result for key, result in zip(keys, results) if isinstance(result, list)})
 
-    def get_prediction_data_summary(self) -> Dict[str, Any]:
+    def _load_prediction_data_summary(self) -> Dict[str, Any]:
         """Get a summary of prediction data from the database or generate new predictions"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            
             # Check if fire_predictions table exists
-            table_check = pd.read_sql_query(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='fire_predictions'", 
-                conn
-            )
-            
-            if table_check.empty:
-                conn.close()
-                # Generate new predictions using ML model
-                predictions = self.generate_predictions_with_ml()
+            if not self._has_predictions_table():
+                # Serve the last predictions generated by the ML model
+                predictions = self.cached_ml_predictions()
                 
                 if predictions:
                     # Calculate summary from generated predictions
-                    total_predictions = len(predictions)
-                    high_risk_predictions = len([p for p in predictions if p.get('risk_level') in ['high', 'critical']])
-                    top_predictions = sorted(predictions, key=lambda x: x.get('probability', 0), reverse=True)[:5]
-                    avg_probability = sum(p.get('probability', 0) for p in predictions) / len(predictions) if predictions else 0
-                    
-                    # Get risk distribution
-                    risk_counts = {}
-                    for p in predictions:
-                        risk = p.get('risk_level', 'unknown')
-                        risk_counts[risk] = risk_counts.get(risk, 0) + 1
-                    
-                    risk_distribution = [{'risk_level': k, 'count': v} for k, v in risk_counts.items()]
-                    
-                    return {
-                        "total_predictions": total_predictions,
-                        "high_risk_predictions": high_risk_predictions,
-                        "top_predictions": top_predictions,
-                        "average_probability": round(avg_probability, 2),
-                        "risk_distribution": risk_distribution,
-                        "source": "ml_generated"
-                    }
+                    summary = _summarize_predictions(predictions)
+                    summary["source"] = "ml_generated"
+                    return summary
                 else:
                     return {
                         "total_predictions": 0,
@@ -265,45 +914,28 @@ RECOMMENDATIONS:
                         "error": "Could not generate predictions with ML model"
                     }
             
-            # Get data from existing table
-            total_predictions = pd.read_sql_query("SELECT COUNT(*) as count FROM fire_predictions", conn).iloc[0]['count']
-            
-            # Get high-risk predictions
-            high_risk_query = """
-            SELECT COUNT(*) as count FROM fire_predictions 
-            WHERE risk_level IN ('high', 'critical')
-            """
-            high_risk_predictions = pd.read_sql_query(high_risk_query, conn).iloc[0]['count']
-            
-            # Get top 5 highest probability predictions
-            top_predictions_query = """
-            SELECT id, latitude, longitude, probability, risk_level, predicted_date, confidence, region 
-            FROM fire_predictions 
-            ORDER BY probability DESC 
-            LIMIT 5
-            """
-            top_predictions = pd.read_sql_query(top_predictions_query, conn)
+            with self._connection() as conn:
+                # Count and probability total per risk level, from which the
+                # overall figures are derived, and the top 5 in one statement
+                risk_groups_json, top_predictions_json = conn.execute(PREDICTION_SUMMARY_SQL).fetchone()
             
-            # Get average prediction probability
-            avg_probability_query = "SELECT AVG(probability) as avg_prob FROM fire_predictions"
-            avg_probability = pd.read_sql_query(avg_probability_query, conn).iloc[0]['avg_prob']
-            
-            # Get risk level distribution
-            risk_distribution_query = """
-            SELECT risk_level, COUNT(*) as count 
-            FROM fire_predictions 
-            GROUP BY risk_level
-            """
-            risk_distribution = pd.read_sql_query(risk_distribution_query, conn)
-            
-            conn.close()
+            risk_groups = json.loads(risk_groups_json)
+            top_predictions = json.loads(top_predictions_json)
+            total_predictions = sum(group[1] for group in risk_groups)
+            high_risk_predictions = sum(group[1] for group in risk_groups if group[0] in ('high', 'critical'))
+            probability_total = sum(group[2] or 0 for group in risk_groups)
+            avg_probability = probability_total / total_predictions if total_predictions else 0
+            risk_distribution = [
+                {'risk_level': risk_level, 'count': count, 'percentage': percentage}
+                for risk_level, count, _, percentage in risk_groups
+            ]
             
             return {
                 "total_predictions": total_predictions,
                 "high_risk_predictions": high_risk_predictions,
-                "top_predictions": top_predictions.to_dict('records'),
+                "top_predictions": top_predictions,
                 "average_probability": round(avg_probability, 2) if avg_probability else 0,
-                "risk_distribution": risk_distribution.to_dict('records'),
+                "risk_distribution": risk_distribution,
                 "source": "database"
             }
             
@@ -314,285 +946,180 @@ RECOMMENDATIONS:
     def get_predictions_by_criteria(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Get predictions based on specific criteria"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            
             # Check if fire_predictions table exists
-            table_check = pd.read_sql_query(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='fire_predictions'", 
-                conn
-            )
-            
-            if table_check.empty:
-                conn.close()
-                # Generate predictions using ML model
+            if not self._has_predictions_table():
+                # Serve the last predictions generated by the ML model
                 region = criteria.get('region', 'all-northern-india')
-                predictions = self.generate_predictions_with_ml(region=region)
+                predictions = self.cached_ml_predictions(region=region)
                 
                 if not predictions:
                     return []
                 
-                # Apply filters
-                filtered_predictions = predictions
-                
-                if criteria.get('min_probability'):
-                    filtered_predictions = [p for p in filtered_predictions if p.get('probability', 0) >= criteria['min_probability']]
-                    
-                if criteria.get('risk_level'):
-                    filtered_predictions = [p for p in filtered_predictions if p.get('risk_level') == criteria['risk_level']]
-                    
-                if criteria.get('region') and criteria['region'] != 'all-northern-india':
-                    filtered_predictions = [p for p in filtered_predictions if p.get('region') == criteria['region']]
-                
-                # Sort by probability and limit
-                filtered_predictions = sorted(filtered_predictions, key=lambda x: x.get('probability', 0), reverse=True)
-                limit = criteria.get('limit', 10)
-                return filtered_predictions[:limit]
-            
-            query = "SELECT * FROM fire_predictions WHERE 1=1"
-            params = []
-            
-            if criteria.get('min_probability'):
-                query += " AND probability >= ?"
-                params.append(criteria['min_probability'])
-                
-            if criteria.get('risk_level'):
-                query += " AND risk_level = ?"
-                params.append(criteria['risk_level'])
-                
-            if criteria.get('region'):
-                query += " AND region = ?"
-                params.append(criteria['region'])
-                
-            if criteria.get('date_from'):
-                query += " AND predicted_date >= ?"
-                params.append(criteria['date_from'])
+                return _filter_predictions(predictions, criteria)
             
-            query += " ORDER BY probability DESC LIMIT ?"
+            keys = tuple(key for key in PREDICTION_CRITERIA_CLAUSES if criteria.get(key))
+            params = [criteria[key] for key in keys]
             params.append(criteria.get('limit', 10))
+            query = _prediction_criteria_query(keys)
             
-            predictions = pd.read_sql_query(query, conn, params=params)
-            conn.close()
-            
-            return predictions.to_dict('records')
+            with self._connection() as conn:
+                return _fetch_records(conn, query, params)
             
         except Exception as e:
             print(f"Error getting predictions by criteria: {e}")
             return []
     
-    def generate_prediction_pdf_report(self, criteria: Dict[str, Any] = None) -> bytes:
-        """Generate a PDF report for predicted fires for authorities"""
-        try:
-            # Use fast prediction generation for PDF reports
-            region = criteria.get('region', 'all-northern-india') if criteria else 'all-northern-india'
-            predictions = self.generate_predictions_with_ml(region=region, days=7)
-            
-            # Calculate summary from generated predictions
-            if predictions:
-                total_predictions = len(predictions)
-                high_risk_predictions = len([p for p in predictions if p.get('risk_level') in ['high', 'critical']])
-                top_predictions = sorted(predictions, key=lambda x: x.get('probability', 0), reverse=True)[:5]
-                avg_probability = sum(p.get('probability', 0) for p in predictions) / len(predictions) if predictions else 0
-                
-                # Get risk distribution
-                risk_counts = {}
-                for p in predictions:
-                    risk = p.get('risk_level', 'unknown')
-                    risk_counts[risk] = risk_counts.get(risk, 0) + 1
-                
-                risk_distribution = [{'risk_level': k, 'count': v} for k, v in risk_counts.items()]
-                
-                prediction_summary = {
-                    "total_predictions": total_predictions,
-                    "high_risk_predictions": high_risk_predictions,
-                    "top_predictions": top_predictions,
-                    "average_probability": round(avg_probability, 2),
-                    "risk_distribution": risk_distribution
-                }
-            else:
-                # Fallback summary
-                prediction_summary = {
-                    "total_predictions": 0,
-                    "high_risk_predictions": 0,
-                    "top_predictions": [],
-                    "average_probability": 0,
-                    "risk_distribution": []
-                }
-                predictions = []
-            
-            # Create PDF in memory
-            buffer = BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=inch)
-            
-            # Get styles
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=18,
-                spaceAfter=30,
-                textColor=colors.darkred,
-                alignment=1  # Center alignment
+    def prepare_prediction_report(self, criteria: Dict[str, Any] = None) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Generate the predictions and summary shown in the PDF report"""
+        # Use fast prediction generation for PDF reports
+        region = criteria.get('region', 'all-northern-india') if criteria else 'all-northern-india'
+        predictions = self.cached_ml_predictions(region=region, days=7)
+        
+        # Calculate summary from generated predictions
+        if predictions:
+            return _summarize_predictions(predictions), predictions
+        
+        # Fallback summary
+        return {
+            "total_predictions": 0,
+            "high_risk_predictions": 0,
+            "top_predictions": [],
+            "average_probability": 0,
+            "risk_distribution": []
+        }, []
+    
+    async def _handle_report(self, intents: set) -> str:
+        """Answer a request for a report"""
+        if "predict" in intents or "authorities" in intents:
+            # Generate prediction PDF report for authorities
+            return "I'll generate a comprehensive fire prediction report for authorities. This report includes ML-based predictions, risk assessments, and actionable recommendations.\n\n📄 **Fire Risk Prediction Report Generated**\n\n**Contents:**\n• Executive summary with prediction statistics\n• Risk level distribution analysis\n• Top high-risk locations with coordinates\n• Detailed recommendations for authorities\n• Emergency response protocols\n\n**Report Features:**\n✅ ML-based fire risk predictions\n✅ Geographic risk mapping\n✅ Authority-ready PDF format\n✅ Actionable response guidelines\n\nThe report has been generated and is ready for download by authorities and emergency services. It contains comprehensive data analysis of predicted fire risks to help with resource allocation and emergency preparedness."
+        elif "top" in intents or "highest" in intents:
+            # Generate report for top fires
+            report = await asyncio.to_thread(self.generate_fire_report, criteria={'limit': 5})
+            return f"Here's a fire situation report:\n\n{report}"
+        else:
+            # Generate prediction report by default
+            return "I'll generate a comprehensive fire prediction report for authorities based on our ML analysis.\n\n📊 **Fire Prediction Analysis Report**\n\n**Report includes:**\n• Current prediction statistics and trends\n• High-risk zone identification\n• Risk level distribution across regions\n• Detailed location coordinates for predicted fires\n• Authority recommendations and action items\n\n**Key Features:**\n🎯 ML-powered risk assessment\n📍 Geographic precision mapping\n⚠️ Emergency response guidelines\n📋 Authority-ready documentation\n\nThis report provides actionable intelligence for fire prevention and emergency preparedness based on advanced machine learning analysis of fire patterns."
+    
+    async def _handle_top_predictions(self, intents: set) -> str:
+        """List the highest probability predictions, for a region if one is named"""
+        # Extract region if mentioned
+        region = next(
+            (slug for keyword, slug in REGION_KEYWORDS.items() if keyword in intents),
+            "all-northern-india"
+        )
+        
+        region_name = region.replace('-', ' ').title()
+        
+        top_predictions = await asyncio.to_thread(self.get_predictions_by_criteria, {'limit': 5, 'region': region})
+        header = TOP_PREDICTIONS_HEADER.format(region=region_name)
+        if not top_predictions:
+            return header + TOP_PREDICTIONS_PENDING
+        
+        rows = [
+            TOP_PREDICTION_ROW.format(
+                rank=rank,
+                id=pred['id'][:8],
+                probability=pred['probability'],
+                risk_level=pred['risk_level'].title(),
+                latitude=pred['latitude'],
+                longitude=pred['longitude'],
+                predicted_date=pred['predicted_date'],
+                region=pred['region'].replace('-', ' ').title(),
+                factors=TOP_PREDICTION_FACTORS.format(factors=', '.join(pred['factors'][:3])) if pred.get('factors') else ""
             )
-            
-            # Build content
-            content = []
-            
-            # Title
-            content.append(Paragraph("FIRE RISK PREDICTION REPORT", title_style))
-            content.append(Paragraph("For Authorities and Emergency Services", styles['Heading2']))
-            content.append(Spacer(1, 20))
-            
-            # Report metadata
-            content.append(Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-            content.append(Paragraph(f"<b>Report Type:</b> Fire Risk Prediction Analysis", styles['Normal']))
-            content.append(Paragraph(f"<b>Coverage:</b> Northern India Region", styles['Normal']))
-            content.append(Spacer(1, 20))
-            
-            # Executive Summary
-            content.append(Paragraph("EXECUTIVE SUMMARY", styles['Heading2']))
-            content.append(Paragraph(f"• Total predictions generated: <b>{prediction_summary['total_predictions']}</b>", styles['Normal']))
-            content.append(Paragraph(f"• High-risk locations identified: <b>{prediction_summary['high_risk_predictions']}</b>", styles['Normal']))
-            content.append(Paragraph(f"• Average fire probability: <b>{prediction_summary['average_probability']}%</b>", styles['Normal']))
-            content.append(Spacer(1, 20))
-            
-            # Risk Level Distribution
-            if prediction_summary.get('risk_distribution'):
-                content.append(Paragraph("RISK LEVEL DISTRIBUTION", styles['Heading2']))
-                risk_data = [['Risk Level', 'Count', 'Percentage']]
-                total = sum([r['count'] for r in prediction_summary['risk_distribution']])
-                for risk in prediction_summary['risk_distribution']:
-                    percentage = round((risk['count'] / total) * 100, 1) if total > 0 else 0
-                    risk_data.append([
-                        risk['risk_level'].title(),
-                        str(risk['count']),
-                        f"{percentage}%"
-                    ])
-                
-                risk_table = Table(risk_data)
-                risk_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-                content.append(risk_table)
-                content.append(Spacer(1, 20))
-            
-            # Top High-Risk Predictions
-            content.append(Paragraph("TOP HIGH-RISK PREDICTIONS", styles['Heading2']))
-            
-            if predictions:
-                pred_data = [['ID', 'Location', 'Probability', 'Risk Level', 'Predicted Date', 'Region']]
-                for pred in predictions[:10]:  # Top 10
-                    pred_data.append([
-                        pred.get('id', 'N/A')[:8] + '...',  # Truncate ID
-                        f"{pred.get('latitude', 0):.3f}, {pred.get('longitude', 0):.3f}",
-                        f"{pred.get('probability', 0):.1f}%",
-                        pred.get('risk_level', 'unknown').title(),
-                        pred.get('predicted_date', 'N/A'),
-                        pred.get('region', 'unknown').replace('-', ' ').title()
-                    ])
-                
-                pred_table = Table(pred_data, colWidths=[1*inch, 1.5*inch, 0.8*inch, 0.8*inch, 1*inch, 1.2*inch])
-                pred_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.darkred),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('FONTSIZE', (0, 1), (-1, -1), 8),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    # Color code risk levels
-                    ('TEXTCOLOR', (3, 1), (3, -1), colors.darkred),
-                ]))
-                content.append(pred_table)
-            else:
-                content.append(Paragraph("No high-risk predictions found.", styles['Normal']))
-            
-            content.append(Spacer(1, 20))
-            
-            # Recommendations
-            content.append(Paragraph("RECOMMENDATIONS FOR AUTHORITIES", styles['Heading2']))
-            recommendations = [
-                "Deploy monitoring resources to high-probability locations immediately",
-                "Coordinate with local fire departments in identified regions",
-                "Prepare fire suppression equipment in critical risk areas",
-                "Issue public advisories for high-risk zones and dates",
-                "Monitor weather conditions that may escalate fire risks",
-                "Establish communication channels with agricultural communities",
-                "Review emergency response protocols for predicted timeframes",
-                "Consider temporary restrictions on burning activities in high-risk areas"
-            ]
-            
-            for i, rec in enumerate(recommendations, 1):
-                content.append(Paragraph(f"{i}. {rec}", styles['Normal']))
-            
-            content.append(Spacer(1, 30))
-            
-            # Footer
-            content.append(Paragraph("This report is generated by the AI Fire Prediction System", styles['Normal']))
-            content.append(Paragraph("For emergency situations, contact local fire departments immediately", styles['Normal']))
-            content.append(Paragraph("Report generated using machine learning analysis of historical fire patterns", styles['Normal']))
-            
-            # Build PDF
-            doc.build(content)
-            
-            # Get PDF bytes
-            pdf_bytes = buffer.getvalue()
-            buffer.close()
-            
-            return pdf_bytes
-            
-        except Exception as e:
-            print(f"Error generating PDF report: {e}")
-            return b""
+            for rank, pred in enumerate(top_predictions, 1)
+        ]
+        return header + "".join(rows) + TOP_PREDICTIONS_NOTE.format(region=region_name)
+    
+    async def _handle_top_fires(self, intents: set) -> str:
+        """List the highest power fires"""
+        top_fires = await asyncio.to_thread(self.get_fires_by_criteria, {'limit': 5})
+        return TOP_FIRES_HEADER + "".join(
+            TOP_FIRE_ROW.format(
+                rank=rank,
+                latitude=float(fire['latitude']),
+                longitude=float(fire['longitude']),
+                frp=float(fire['frp']),
+                brightness=float(fire['brightness']),
+                acq_date=fire['acq_date'],
+                acq_time=fire['acq_time']
+            )
+            for rank, fire in enumerate(top_fires, 1)
+        )
+    
+    async def _handle_prediction_summary(self, intents: set) -> str:
+        """Summarize the prediction data"""
+        summary = await asyncio.to_thread(self.get_prediction_data_summary)
+        risk_breakdown = "".join(
+            RISK_BREAKDOWN_ROW.format(risk_level=risk['risk_level'].title(), count=risk['count'])
+            for risk in summary.get('risk_distribution') or ()
+        )
+        top_predictions = "\n".join(
+            SUMMARY_PREDICTION_ROW.format(
+                rank=rank,
+                probability=pred['probability'],
+                latitude=pred['latitude'],
+                longitude=pred['longitude'],
+                risk_level=pred['risk_level'].title()
+            )
+            for rank, pred in enumerate(summary.get('top_predictions', [])[:3], 1)
+        ) if summary.get('top_predictions') else "No predictions available"
+        
+        return PREDICTION_SUMMARY_TEMPLATE.format(
+            total_predictions=summary.get('total_predictions', 0),
+            high_risk_predictions=summary.get('high_risk_predictions', 0),
+            average_probability=summary.get('average_probability', 0),
+            risk_breakdown=risk_breakdown,
+            top_predictions=top_predictions
+        )
+    
+    async def _handle_fire_summary(self, intents: set) -> str:
+        """Summarize the fire detection data"""
+        summary = await asyncio.to_thread(self.get_fire_data_summary)
+        top_fires = "\n".join(
+            SUMMARY_FIRE_ROW.format(
+                rank=rank,
+                frp=float(fire['frp']),
+                latitude=float(fire['latitude']),
+                longitude=float(fire['longitude']),
+                acq_date=fire['acq_date']
+            )
+            for rank, fire in enumerate(summary.get('top_fires', [])[:3], 1)
+        ) if summary.get('top_fires') else "No fires available"
+        
+        return FIRE_SUMMARY_TEMPLATE.format(
+            total_fires=summary.get('total_fires', 0),
+            recent_fires=summary.get('recent_fires', 0),
+            average_power=summary.get('average_power', 0),
+            top_fires=top_fires
+        )
     
     async def chat_with_claude(self, user_message: str, conversation_history: List[Dict[str, str]] = None) -> str:
         """Chat with Claude using fire data and prediction context and tools"""
         try:
-            # Get both fire data and prediction data context
-            fire_summary = self.get_fire_data_summary()
-            prediction_summary = self.get_prediction_data_summary()
+            # Check if user wants specific tools
+            intents = set(INTENT_PATTERN.findall(user_message.lower()))
+            handler = next((handler for matches, handler in self._intent_handlers if matches(intents)), None)
+            if handler is not None:
+                return await handler(intents)
+            
+            # Only general questions need the data context; get both summaries side by side
+            fire_summary, prediction_summary = await asyncio.gather(
+                asyncio.to_thread(self.get_fire_data_summary),
+                asyncio.to_thread(self.get_prediction_data_summary)
+            )
             
             # System prompt with tools and context
-            system_prompt = f"""You are an AI assistant for a fire detection and prediction system. You have access to databases of both historical fire detections and future fire predictions.
-
-CURRENT FIRE DETECTION DATA:
-- Total fires detected: {fire_summary.get('total_fires', 0)}
-- Recent fires (7 days): {fire_summary.get('recent_fires', 0)}
-- Average fire power: {fire_summary.get('average_power', 0)} MW
-
-CURRENT PREDICTION DATA:
-- Total predictions: {prediction_summary.get('total_predictions', 0)}
-- High-risk predictions: {prediction_summary.get('high_risk_predictions', 0)}
-- Average prediction probability: {prediction_summary.get('average_probability', 0)}%
-
-You can help users with:
-1. Generating PDF reports for authorities about predicted fires (priority feature)
-2. Analyzing prediction data and fire risk summaries
-3. Finding top predictions by probability, risk level, or location
-4. Calculating statistics about fire predictions and detection
-5. Providing recommendations for fire management and prevention
-6. Comparing historical fire data with future predictions
-
-Available tools:
-- get_prediction_summary: Get overall prediction statistics
-- get_top_predictions: Get highest probability predictions
-- generate_prediction_report: Create official PDF reports for authorities
-- search_predictions: Find predictions by criteria (probability, risk level, region, date)
-- get_fire_summary: Get overall fire detection statistics
-- generate_fire_report: Create reports for detected fires
-
-IMPORTANT: When users ask for "report" or "generate report", prioritize creating prediction reports using ML data and provide PDF downloads for authorities.
-
-Be helpful, accurate, and provide actionable information for fire management and prediction."""
-
+            system_prompt = SYSTEM_PROMPT_TEMPLATE.format(
+                total_fires=fire_summary.get('total_fires', 0),
+                recent_fires=fire_summary.get('recent_fires', 0),
+                average_power=fire_summary.get('average_power', 0),
+                total_predictions=prediction_summary.get('total_predictions', 0),
+                high_risk_predictions=prediction_summary.get('high_risk_predictions', 0),
+                average_probability=prediction_summary.get('average_probability', 0)
+            )
+            
             # Prepare conversation history
             messages = []
             if conversation_history:
@@ -608,116 +1135,11 @@ Be helpful, accurate, and provide actionable information for fire management and
                 "content": user_message
             })
             
-            # Check if user wants specific tools
-            if "report" in user_message.lower():
-                if "prediction" in user_message.lower() or "predict" in user_message.lower() or "authorities" in user_message.lower():
-                    # Generate prediction PDF report for authorities
-                    return "I'll generate a comprehensive fire prediction report for authorities. This report includes ML-based predictions, risk assessments, and actionable recommendations.\n\n📄 **Fire Risk Prediction Report Generated**\n\n**Contents:**\n• Executive summary with prediction statistics\n• Risk level distribution analysis\n• Top high-risk locations with coordinates\n• Detailed recommendations for authorities\n• Emergency response protocols\n\n**Report Features:**\n✅ ML-based fire risk predictions\n✅ Geographic risk mapping\n✅ Authority-ready PDF format\n✅ Actionable response guidelines\n\nThe report has been generated and is ready for download by authorities and emergency services. It contains comprehensive data analysis of predicted fire risks to help with resource allocation and emergency preparedness."
-                elif "top" in user_message.lower() or "highest" in user_message.lower():
-                    # Generate report for top fires
-                    report = self.generate_fire_report(criteria={'limit': 5})
-                    return f"Here's a fire situation report:\n\n{report}"
-                else:
-                    # Generate prediction report by default
-                    return "I'll generate a comprehensive fire prediction report for authorities based on our ML analysis.\n\n📊 **Fire Prediction Analysis Report**\n\n**Report includes:**\n• Current prediction statistics and trends\n• High-risk zone identification\n• Risk level distribution across regions\n• Detailed location coordinates for predicted fires\n• Authority recommendations and action items\n\n**Key Features:**\n🎯 ML-powered risk assessment\n📍 Geographic precision mapping\n⚠️ Emergency response guidelines\n📋 Authority-ready documentation\n\nThis report provides actionable intelligence for fire prevention and emergency preparedness based on advanced machine learning analysis of fire patterns."
-            
-            elif "top" in user_message.lower() and ("prediction" in user_message.lower() or "predict" in user_message.lower()):
-                # Extract region if mentioned
-                region = "all-northern-india"
-                if "punjab" in user_message.lower():
-                    region = "punjab"
-                elif "haryana" in user_message.lower():
-                    region = "haryana"
-                elif "uttar pradesh" in user_message.lower() or "up" in user_message.lower():
-                    region = "uttar-pradesh"
-                elif "delhi" in user_message.lower():
-                    region = "delhi"
-                elif "rajasthan" in user_message.lower():
-                    region = "rajasthan"
-                elif "himachal" in user_message.lower():
-                    region = "himachal-pradesh"
-                elif "uttarakhand" in user_message.lower():
-                    region = "uttarakhand"
-                
-                top_predictions = self.get_predictions_by_criteria({'limit': 5, 'region': region})
-                response = f"Here are the top 5 highest probability fire predictions for {region.replace('-', ' ').title()}:\n\n"
-                if top_predictions:
-                    for i, pred in enumerate(top_predictions, 1):
-                        response += f"{i}. Prediction ID: {pred['id'][:8]}...\n"
-                        response += f"   🔥 Probability: {pred['probability']:.1f}%\n"
-                        response += f"   ⚠️ Risk Level: {pred['risk_level'].title()}\n"
-                        response += f"   📍 Location: {pred['latitude']:.4f}, {pred['longitude']:.4f}\n"
-                        response += f"   📅 Predicted Date: {pred['predicted_date']}\n"
-                        response += f"   🗺️ Region: {pred['region'].replace('-', ' ').title()}\n"
-                        if pred.get('factors'):
-                            response += f"   🔍 Risk Factors: {', '.join(pred['factors'][:3])}\n"
-                        response += "\n"
-                    response += f"**Note:** Predictions generated using ML analysis of historical patterns, weather data, and crop cycles for {region.replace('-', ' ').title()} region."
-                else:
-                    response += "Generating new fire risk predictions using machine learning models...\n\n"
-                    response += "**Analysis includes:**\n"
-                    response += "• Historical fire pattern analysis\n"
-                    response += "• Weather and environmental data\n"
-                    response += "• Agricultural practice monitoring\n"
-                    response += "• Seasonal risk assessment\n\n"
-                    response += "Please try again in a moment as the system generates fresh predictions."
-                return response
-            
-            elif "top" in user_message.lower() and "fire" in user_message.lower():
-                top_fires = self.get_fires_by_criteria({'limit': 5})
-                response = "Here are the top 5 highest power fires:\n\n"
-                for i, fire in enumerate(top_fires, 1):
-                    response += f"{i}. Fire Location: {float(fire['latitude']):.4f}, {float(fire['longitude']):.4f}\n"
-                    response += f"   Power: {float(fire['frp']):.1f} MW\n"
-                    response += f"   Brightness: {float(fire['brightness']):.1f}K\n"
-                    response += f"   Date: {fire['acq_date']} at {fire['acq_time']}\n\n"
-                return response
-            
-            elif "summary" in user_message.lower() or "statistics" in user_message.lower():
-                if "prediction" in user_message.lower() or "predict" in user_message.lower():
-                    # Prediction summary
-                    summary = self.get_prediction_data_summary()
-                    risk_breakdown = ""
-                    if summary.get('risk_distribution'):
-                        for risk in summary['risk_distribution']:
-                            risk_breakdown += f"• {risk['risk_level'].title()}: {risk['count']} predictions\n"
-                    
-                    return f"""Fire Prediction Summary:
-
-🎯 **Prediction Statistics:**
-- Total predictions generated: {summary.get('total_predictions', 0)}
-- High-risk predictions: {summary.get('high_risk_predictions', 0)}
-- Average prediction probability: {summary.get('average_probability', 0)}%
-
-📊 **Risk Level Distribution:**
-{risk_breakdown}
-
-🔥 **Top 3 Highest Probability Predictions:**
-{chr(10).join([f"{i+1}. {pred['probability']:.1f}% risk at ({pred['latitude']:.4f}, {pred['longitude']:.4f}) - {pred['risk_level'].title()} level" 
-               for i, pred in enumerate(summary.get('top_predictions', [])[:3])]) if summary.get('top_predictions') else "No predictions available"}
-
-The system uses ML analysis to predict fire risks and can generate comprehensive PDF reports for authorities."""
-                else:
-                    # Fire detection summary
-                    summary = self.get_fire_data_summary()
-                    return f"""Fire Detection Summary:
-
-📊 **Detection Statistics:**
-- Total fires detected: {summary.get('total_fires', 0)}
-- Recent fires (last 7 days): {summary.get('recent_fires', 0)}
-- Average fire power: {summary.get('average_power', 0)} MW
-
-🔥 **Top 3 Highest Power Fires:**
-{chr(10).join([f"{i+1}. {float(fire['frp']):.1f} MW at ({float(fire['latitude']):.4f}, {float(fire['longitude']):.4f}) on {fire['acq_date']}" 
-               for i, fire in enumerate(summary.get('top_fires', [])[:3])]) if summary.get('top_fires') else "No fires available"}
-
-The system is actively monitoring fire activity and can generate detailed reports for authorities when needed."""
-            
             # For general questions, use Claude API
-            response = self.client.messages.create(
+            response = await self.client.messages.create(
                 model="claude-3-haiku-20240307",
                 max_tokens=300,
-                system=system_prompt + "\n\nIMPORTANT: Keep responses concise and under 300 tokens. Be helpful but brief.",
+                system=system_prompt,
                 messages=messages
             )
             
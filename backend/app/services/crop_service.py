@@ -1,10 +1,29 @@
 from typing import Dict, List, Tuple
 from datetime import datetime, timedelta
 from app.models.prediction import CropData
+from app.utils.regions import classify_regions, pack_region_bounds
 import calendar
+import numpy as np
+
+# Regions with crop patterns, checked in order when locating a point
+CROP_REGIONS = ("punjab", "haryana", "uttar-pradesh", "rajasthan")
+
+# Risk score multipliers by residue amount and harvest season
+RESIDUE_MULTIPLIERS = {
+    "high": 1.2,
+    "medium": 1.0,
+    "low": 0.7
+}
+SEASON_MULTIPLIERS = {
+    "peak": 1.3,
+    "active": 1.0,
+    "off": 0.5
+}
 
 class CropPatternService:
     def __init__(self):
+        self._region_arrays = pack_region_bounds(CROP_REGIONS)
+        
         # Northern India crop patterns and burning seasons
         self.crop_patterns = {
             "punjab": {
@@ -88,6 +107,13 @@ class CropPatternService:
                 }
             }
         }
+        
+        # Crop fields only depend on region and month, so build them once;
+        # index 0 is unused so the lists can be indexed by month number
+        self._crop_tables = {
+            region: [None] + [self._crop_fields_for_month(region, month) for month in range(1, 13)]
+            for region in self.crop_patterns
+        }
     
     def get_crop_data_for_location(self, latitude: float, longitude: float, target_date: datetime = None) -> List[CropData]:
         """Get crop data for a specific location and date"""
@@ -98,13 +124,20 @@ class CropPatternService:
         if not region or region not in self.crop_patterns:
             return []
         
-        crop_data_list = []
-        current_month = target_date.month
+        location = f"{latitude:.4f},{longitude:.4f}"
+        return [
+            CropData(**fields, location=location)
+            for fields in self._crop_tables[region][target_date.month]
+        ]
+    
+    def _crop_fields_for_month(self, region: str, month: int) -> List[Dict]:
+        """Build the CropData fields for each crop in a region during a month"""
+        crop_fields = []
         
         for crop_name, crop_info in self.crop_patterns[region].items():
             # Determine if we're in harvest or burning season
-            harvest_season = self._get_season_status(current_month, crop_info["harvest_months"])
-            burning_season = self._get_season_status(current_month, crop_info["burning_peak"])
+            harvest_season = self._get_season_status(month, crop_info["harvest_months"])
+            burning_season = self._get_season_status(month, crop_info["burning_peak"])
             
             # Calculate burning probability based on season
             base_probability = crop_info["burning_probability"]
@@ -134,18 +167,15 @@ class CropPatternService:
                 elif residue_amount == "medium":
                     residue_amount = "high"
             
-            crop_data = CropData(
-                crop_type=crop_name,
-                harvest_season=harvest_season,
-                burning_probability=round(burning_probability, 3),
-                residue_amount=residue_amount,
-                area_hectares=self._estimate_area_hectares(crop_info["area_percentage"], region),
-                location=f"{latitude:.4f},{longitude:.4f}"
-            )
-            
-            crop_data_list.append(crop_data)
+            crop_fields.append({
+                "crop_type": crop_name,
+                "harvest_season": harvest_season,
+                "burning_probability": round(burning_probability, 3),
+                "residue_amount": residue_amount,
+                "area_hectares": self._estimate_area_hectares(crop_info["area_percentage"], region)
+            })
         
-        return crop_data_list
+        return crop_fields
     
     def calculate_crop_risk_score(self, crop_data_list: List[CropData]) -> float:
         """Calculate overall crop-based fire risk score (0-100)"""
@@ -163,18 +193,10 @@ class CropPatternService:
             area_weight = min(crop.area_hectares / 10000, 1.0)  # Normalize to max 1.0
             
             # Adjust by residue amount
-            residue_multiplier = {
-                "high": 1.2,
-                "medium": 1.0,
-                "low": 0.7
-            }.get(crop.residue_amount, 1.0)
+            residue_multiplier = RESIDUE_MULTIPLIERS.get(crop.residue_amount, 1.0)
             
             # Season multiplier
-            season_multiplier = {
-                "peak": 1.3,
-                "active": 1.0,
-                "off": 0.5
-            }.get(crop.harvest_season, 0.5)
+            season_multiplier = SEASON_MULTIPLIERS.get(crop.harvest_season, 0.5)
             
             crop_score = base_score * residue_multiplier * season_multiplier
             weighted_score = crop_score * area_weight
@@ -216,17 +238,11 @@ class CropPatternService:
     
     def _get_region_from_coordinates(self, latitude: float, longitude: float) -> str:
         """Determine region based on coordinates"""
-        # Simplified region detection based on coordinate ranges
-        if 29.5 <= latitude <= 32.5 and 73.5 <= longitude <= 76.5:
-            return "punjab"
-        elif 27.5 <= latitude <= 30.9 and 74.0 <= longitude <= 77.5:
-            return "haryana"
-        elif 23.8 <= latitude <= 30.4 and 77.0 <= longitude <= 84.6:
-            return "uttar-pradesh"
-        elif 23.0 <= latitude <= 30.2 and 69.5 <= longitude <= 78.3:
-            return "rajasthan"
-        else:
-            return "unknown"
+        return self._get_regions_from_coordinates([latitude], [longitude])[0]
+    
+    def _get_regions_from_coordinates(self, latitudes, longitudes) -> np.ndarray:
+        """Determine regions for arrays of coordinates in one pass"""
+        return classify_regions(latitudes, longitudes, self._region_arrays, default="unknown")
     
     def _get_season_status(self, current_month: int, season_months: List[int]) -> str:
         """Determine if current month is in peak, active, or off season"""
@@ -1,17 +1,54 @@
+import os
+import threading
 import requests
 import pandas as pd
-from io import StringIO
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as TransportError
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from app.models.fire import FireDetectionCreate
-from app.utils.regions import get_region_bounds, is_point_in_region
+from app.utils.regions import get_region_bounds, get_state_from_coordinates, get_states_from_coordinates, is_point_in_region
+
+# The 24hr and 7-day FIRMS feeds update far less often than they are requested
+FEED_CACHE_TTL_SECONDS = int(os.getenv("FIRMS_CACHE_TTL_SECONDS", "120"))
+
+# Keep-alive connections to FIRMS, with a couple of quick retries on failures
+FIRMS_HTTP_RETRY = Retry(total=2, backoff_factor=0.2)
 
 class FireAPIService:
     def __init__(self, map_key: str = "8895c7fb00b5e05b915b2bcddf354a2b"):
         self.map_key = map_key
         self.base_url = f"https://firms.modaps.eosdis.nasa.gov/mapserver/wfs/South_Asia/{map_key}/"
+        self._feed_cache = TTLCache(maxsize=8, ttl=FEED_CACHE_TTL_SECONDS)
+        self._feed_lock = threading.Lock()
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=FIRMS_HTTP_RETRY))
     
     def fetch_fire_data(self, typename: str, count: int = 1000) -> pd.DataFrame:
+        """
+        Fetch fire data from NASA FIRMS, cached for FEED_CACHE_TTL_SECONDS
+        
+        Args:
+            typename: Either 'ms:fires_modis_24hrs' or 'ms:fires_modis_7days'
+            count: Maximum number of records to fetch
+        
+        Returns:
+            pandas.DataFrame: Fire data
+        """
+        key = (typename, count)
+        with self._feed_lock:
+            df = self._feed_cache.get(key)
+        if df is None:
+            df = self._download_fire_data(typename, count)
+            # Failed downloads come back empty; retry those on the next request
+            if not df.empty:
+                with self._feed_lock:
+                    self._feed_cache[key] = df
+        return df.copy(deep=False)
+    
+    def _download_fire_data(self, typename: str, count: int) -> pd.DataFrame:
         """
         Fetch fire data from NASA FIRMS WFS service
         
@@ -35,16 +72,18 @@ class FireAPIService:
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            # Read CSV data into DataFrame
-            csv_data = StringIO(response.text)
-            df = pd.read_csv(csv_data)
+            with self.session.get(self.base_url, params=params, timeout=30, stream=True,
+                                  headers={'Accept-Encoding': 'gzip'}) as response:
+                response.raise_for_status()
+                
+                # Parse the CSV straight off the (gunzipped) socket with Arrow's
+                # multithreaded reader; keep dates as the plain strings FIRMS sends
+                response.raw.decode_content = True
+                df = pd.read_csv(response.raw, engine='pyarrow', dtype={'acq_date': str})
             
             return df
             
-        except requests.RequestException as e:
+        except (requests.RequestException, TransportError) as e:
             print(f"Error fetching data: {e}")
             return pd.DataFrame()
     
@@ -106,30 +145,47 @@ class FireAPIService:
                 df = df[mask]
                 print(f"Filtered to {region}: {len(df)} records remaining")
         
-        # Convert DataFrame rows to FireDetectionCreate objects
-        for _, row in df.iterrows():
+        # Convert whole columns up front instead of one row at a time
+        def column(name, default):
+            return df[name] if name in df.columns else pd.Series(default, index=df.index)
+        
+        def optional_values(name):
+            values = pd.to_numeric(column(name, None), errors='coerce')
+            return values.astype(object).where(values.notna(), None).tolist()
+        
+        # Rows whose confidence isn't numeric were skipped by int() before
+        confidence = pd.to_numeric(column('confidence', 0), errors='coerce')
+        valid = confidence.notna().to_numpy()
+        
+        latitudes = df[lat_col].astype(float).to_numpy()[valid].tolist()
+        longitudes = df[lon_col].astype(float).to_numpy()[valid].tolist()
+        brightness = pd.to_numeric(column('brightness', 0), errors='coerce').to_numpy()[valid].tolist()
+        confidences = confidence.to_numpy()[valid].astype(int).tolist()
+        acq_dates = column('acq_date', '').astype(str).to_numpy()[valid].tolist()
+        acq_times = column('acq_time', '0000').astype(str).str.zfill(4).to_numpy()[valid].tolist()
+        states = get_states_from_coordinates(latitudes, longitudes).tolist()
+        frps, scans, tracks = (
+            [value for value, keep in zip(optional_values(name), valid) if keep]
+            for name in ('frp', 'scan', 'track')
+        )
+        
+        # Convert column values to FireDetectionCreate objects
+        for lat, lon, bright, conf, acq_date, acq_time, frp, scan, track, state in zip(
+            latitudes, longitudes, brightness, confidences, acq_dates, acq_times, frps, scans, tracks, states
+        ):
             try:
-                # Generate unique ID
-                fire_id = f"{source}_{row[lat_col]:.4f}_{row[lon_col]:.4f}_{row.get('acq_date', '')}_{row.get('acq_time', '')}"
-                
-                # Parse acquisition datetime
-                acq_date = str(row.get('acq_date', ''))
-                acq_time = str(row.get('acq_time', '0000')).zfill(4)
-                
-                # Determine state based on coordinates
-                state = self._get_state_from_coordinates(row[lat_col], row[lon_col])
-                
+                # The stored ID is derived from these fields when FireService saves the fire
                 fire = FireDetectionCreate(
-                    latitude=float(row[lat_col]),
-                    longitude=float(row[lon_col]),
-                    brightness=float(row.get('brightness', 0)),
-                    confidence=int(row.get('confidence', 0)),
+                    latitude=lat,
+                    longitude=lon,
+                    brightness=bright,
+                    confidence=conf,
                     acq_date=acq_date,
                     acq_time=acq_time,
                     source=source,
-                    frp=float(row.get('frp', 0)) if pd.notna(row.get('frp')) else None,
-                    scan=float(row.get('scan', 0)) if pd.notna(row.get('scan')) else None,
-                    track=float(row.get('track', 0)) if pd.notna(row.get('track')) else None,
+                    frp=frp,
+                    scan=scan,
+                    track=track,
                     state=state
                 )
                 
@@ -144,22 +200,4 @@ class FireAPIService:
     
     def _get_state_from_coordinates(self, lat: float, lon: float) -> Optional[str]:
         """Determine state based on coordinates"""
-        # Simple state detection based on coordinate ranges
-        # This is a simplified version - you might want to use a more sophisticated method
-        
-        state_bounds = {
-            'punjab': {'min_lat': 29.5, 'max_lat': 32.5, 'min_lon': 73.5, 'max_lon': 76.5},
-            'haryana': {'min_lat': 27.5, 'max_lat': 30.9, 'min_lon': 74.0, 'max_lon': 77.5},
-            'uttar-pradesh': {'min_lat': 23.8, 'max_lat': 30.4, 'min_lon': 77.0, 'max_lon': 84.6},
-            'delhi': {'min_lat': 28.4, 'max_lat': 28.9, 'min_lon': 76.8, 'max_lon': 77.3},
-            'rajasthan': {'min_lat': 23.0, 'max_lat': 30.2, 'min_lon': 69.5, 'max_lon': 78.3},
-            'himachal-pradesh': {'min_lat': 30.2, 'max_lat': 33.2, 'min_lon': 75.5, 'max_lon': 79.0},
-            'uttarakhand': {'min_lat': 28.4, 'max_lat': 31.5, 'min_lon': 77.5, 'max_lon': 81.1}
-        }
-        
-        for state, bounds in state_bounds.items():
-            if (bounds['min_lat'] <= lat <= bounds['max_lat'] and 
-                bounds['min_lon'] <= lon <= bounds['max_lon']):
-                return state
-        
-        return None
\ No newline at end of file
+        return get_state_from_coordinates(lat, lon)
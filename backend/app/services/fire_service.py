@@ -1,26 +1,175 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, select, bindparam, func, case
+from datetime import datetime
 from typing import List, Optional
+from collections import Counter
+from functools import lru_cache
+import calendar
+import numpy as np
+import time
 import uuid
 
-from app.models.fire import FireDetection, FireDetectionCreate, FireDetectionResponse, UserReportedFire, UserReportedFireCreate, UserReportedFireResponse
+from app.database.connection import SessionManager
+from app.models.fire import SourceMask, SOURCE_IDS, FireDetection, FireDetectionCreate, FireDetectionResponse, UserReportedFire, UserReportedFireCreate, UserReportedFireResponse
 from app.services.fire_api import FireAPIService
 from app.services.historical_fire_service import HistoricalFireService
-from app.utils.regions import is_point_in_region
+from app.utils.regions import REGION_BOUNDS, get_state_from_coordinates, is_point_in_region
+
+# Look-back window in seconds for the recent date ranges
+RECENT_WINDOWS = {"24hr": 24 * 60 * 60, "7day": 7 * 24 * 60 * 60}
+STORED_FIRES_BATCH_SIZE = 1000
+
+# FIRMS feeds include detections a little older than their nominal window;
+# until a feed batch has been ingested, reach back this much further instead
+FEED_GRACE_SECONDS = 6 * 60 * 60
+
+# Oldest acquisition time in the last ingested feed batch, per (region, date_range)
+_feed_start_epochs = {}
+
+def _window_params(region: str, date_range: str, end_epoch: Optional[int] = None) -> dict:
+    """Epoch bounds of a recent window ending at end_epoch, or now if not given,
+    starting early enough to cover the last ingested feed batch"""
+    if end_epoch is None:
+        end_epoch = int(time.time())
+    start_epoch = end_epoch - RECENT_WINDOWS[date_range]
+    feed_start_epoch = _feed_start_epochs.get((region, date_range))
+    if feed_start_epoch is None:
+        start_epoch -= FEED_GRACE_SECONDS
+    else:
+        start_epoch = min(start_epoch, feed_start_epoch)
+    return {"start_epoch": start_epoch, "end_epoch": end_epoch}
+
+# Regions that map directly onto a stored state value
+STATE_REGION_KEYS = frozenset(['punjab', 'haryana', 'uttar-pradesh', 'delhi', 'rajasthan', 'himachal-pradesh', 'uttarakhand'])
+
+# How a user report's severity translates into detection-style values
+SEVERITY_CONFIDENCE = {"Low": 25, "Medium": 50, "High": 75, "Critical": 95}
+SEVERITY_BRIGHTNESS = {"Low": 300, "Medium": 320, "High": 350, "Critical": 400}
+SEVERITY_FRP_MULTIPLIER = {"Low": 1, "Medium": 1.5, "High": 2, "Critical": 3}
+
+# Bounding-box clause for every known region, built once at import
+REGION_FILTERS = {
+    region: and_(
+        FireDetection.latitude.between(bounds['min_lat'], bounds['max_lat']),
+        FireDetection.longitude.between(bounds['min_lon'], bounds['max_lon'])
+    )
+    for region, bounds in REGION_BOUNDS.items()
+}
+
+def _stored_fire_criteria(region: str) -> list:
+    """WHERE clauses for stored fires in a region; sources and window are bound per call"""
+    criteria = [
+        FireDetection.source_id.op("&")(bindparam("source_mask")) != 0,
+        FireDetection.acq_epoch.between(bindparam("start_epoch"), bindparam("end_epoch"))
+    ]
+    
+    region_filter = REGION_FILTERS.get(region)
+    if region_filter is not None:
+        criteria.append(region_filter)
+    
+    return criteria
+
+@lru_cache(maxsize=256)
+def _stored_fires_stmt(region: str):
+    """Build the stored-fire select once per region"""
+    stmt = select(FireDetection).where(*_stored_fire_criteria(region))
+    
+    # Stream rows from the cursor in batches instead of materializing the whole window
+    return stmt.order_by(FireDetection.acq_epoch).execution_options(yield_per=STORED_FIRES_BATCH_SIZE)
+
+@lru_cache(maxsize=256)
+def _stored_statistics_stmt(region: str):
+    """Build the per source/state aggregate over stored fires once per region"""
+    return select(
+        FireDetection.source,
+        FireDetection.state,
+        func.count(),
+        func.sum(case((FireDetection.confidence >= 80, 1), else_=0)),
+        func.sum(FireDetection.confidence),
+        func.coalesce(func.sum(FireDetection.frp), 0.0)
+    ).where(*_stored_fire_criteria(region)).group_by(FireDetection.source, FireDetection.state)
+
+# Field order of the rows gathered for the columnar fire layout
+FIRE_COLUMNS = ("id", "latitude", "longitude", "brightness", "confidence", "acq_epoch", "source", "frp", "state")
+
+@lru_cache(maxsize=256)
+def _stored_columns_stmt(region: str):
+    """Select only the columnar fields of stored fires, once per region"""
+    return select(*(getattr(FireDetection, column) for column in FIRE_COLUMNS)).where(
+        *_stored_fire_criteria(region)
+    ).order_by(FireDetection.acq_epoch)
+
+def _utc_epoch(value: datetime) -> int:
+    """Epoch seconds for an aware datetime, or a naive one stored in UTC"""
+    if value.tzinfo is not None:
+        return int(value.timestamp())
+    return calendar.timegm(value.timetuple())
+
+def _response_row(fire: FireDetectionResponse) -> tuple:
+    """Flatten a response model into a FIRE_COLUMNS row"""
+    # FIRMS times and user report times are both stored in UTC
+    return (
+        fire.id, fire.latitude, fire.longitude, fire.brightness, fire.confidence,
+        _utc_epoch(fire.acq_datetime), fire.source, fire.frp, fire.state
+    )
+
+def _rows_to_columns(rows: list) -> dict:
+    """Transpose FIRE_COLUMNS rows into per-field arrays; missing FRP becomes NaN"""
+    ids, lats, lons, brightness, confidence, epochs, sources, frp, states = zip(*rows) if rows else ((),) * len(FIRE_COLUMNS)
+    return {
+        "id": list(ids),
+        "latitude": np.array(lats, dtype=np.float32),
+        "longitude": np.array(lons, dtype=np.float32),
+        "brightness": np.array(brightness, dtype=np.float32),
+        "confidence": np.array(confidence, dtype=np.uint8),
+        "acq_epoch": np.array(epochs, dtype=np.int64),
+        "source": list(sources),
+        "frp": np.array([np.nan if value is None else value for value in frp], dtype=np.float32),
+        "state": list(states)
+    }
+
+@lru_cache(maxsize=None)
+def _user_reported_fires_stmt(state: Optional[str]):
+    """Build the user report select once per state; the window is bound per call"""
+    stmt = select(UserReportedFire).where(
+        UserReportedFire.reported_at.between(bindparam("since_date"), bindparam("until_date"))
+    )
+    if state:
+        stmt = stmt.where(UserReportedFire.state == state)
+    return stmt
+
+@lru_cache(maxsize=None)
+def _user_reports_stmt(state: Optional[str], filter_status: bool):
+    """Build the newest-first user report listing once per state; status and limit are bound per call"""
+    stmt = select(UserReportedFire)
+    if filter_status:
+        stmt = stmt.where(UserReportedFire.status == bindparam("status_filter"))
+    if state:
+        stmt = stmt.where(UserReportedFire.state == state)
+    return stmt.order_by(UserReportedFire.reported_at.desc()).limit(bindparam("limit"))
 
 class FireService:
+    # Collaborators shared by every instance (the API service keeps its feed
+    # cache across requests); only the session is per call
+    api_service = FireAPIService()
+    historical_service = HistoricalFireService()
+    
     def __init__(self, db: Session):
         self.db = db
-        self.api_service = FireAPIService()
-        self.historical_service = HistoricalFireService()
+    
+    @classmethod
+    def for_session(cls, db: Session) -> "FireService":
+        """Bind the shared service to a request's database session"""
+        return cls(db)
     
     def get_fires_by_filters(self, 
                            region: str = "all-northern-india",
                            date_range: str = "24hr",
                            custom_start_date: Optional[str] = None,
                            custom_end_date: Optional[str] = None,
-                           sources: dict = None) -> List[FireDetectionResponse]:
+                           sources: int = None,
+                           ingest: bool = True,
+                           end_epoch: Optional[int] = None) -> List[FireDetectionResponse]:
         """
         Get fires based on filters
         
@@ -29,47 +178,47 @@ class FireService:
             date_range: "24hr", "7day", or "custom"
             custom_start_date: Start date for custom range (YYYY-MM-DD)
             custom_end_date: End date for custom range (YYYY-MM-DD)
-            sources: Dictionary of enabled sources
+            sources: SourceMask bits of enabled sources
+            ingest: Refresh recent fires from the API before reading
+            end_epoch: End of the recent window; defaults to now
             
         Returns:
             List of FireDetectionResponse objects
         """
         if sources is None:
-            sources = {"MODIS": True, "VIIRS": True, "User Reported": False}
+            sources = SourceMask.MODIS | SourceMask.VIIRS
         
         if date_range in ["24hr", "7day"]:
             # Use API for recent data
-            return self._get_recent_fires(region, date_range, sources)
+            return self._get_recent_fires(region, date_range, sources, ingest, end_epoch)
         elif date_range == "custom" and custom_start_date and custom_end_date:
             # Use database for custom date range
             return self._get_custom_date_fires(region, custom_start_date, custom_end_date, sources)
         else:
             return []
     
-    def _get_recent_fires(self, region: str, date_range: str, sources: dict) -> List[FireDetectionResponse]:
+    def _get_recent_fires(self, region: str, date_range: str, sources: int, ingest: bool = True,
+                          end_epoch: Optional[int] = None) -> List[FireDetectionResponse]:
         """Get recent fires from API and update database"""
         fires = []
         
         try:
-            if sources.get("MODIS", False):
-                if date_range == "24hr":
-                    api_fires = self.api_service.get_24hr_fires(region)
-                else:  # 7day
-                    api_fires = self.api_service.get_7day_fires(region)
-                
-                # Save to database and convert to response format
-                for fire_data in api_fires:
-                    fire_db = self._save_fire_to_db(fire_data)
-                    if fire_db:
-                        fires.append(self._convert_to_response(fire_db))
+            if ingest:
+                self.ingest_recent_fires(region, date_range, sources)
+            window = _window_params(region, date_range, end_epoch)
+            
+            # Read back everything stored for the window from the enabled satellites
+            satellite_mask = sources & (SourceMask.MODIS | SourceMask.VIIRS)
+            if satellite_mask:
+                fires.extend(self._get_stored_fires(region, window, satellite_mask))
             
             # Add user-reported fires if enabled
-            if sources.get("User Reported", False):
-                user_fires = self._get_user_reported_fires(region, date_range)
+            if sources & SourceMask.USER:
+                user_fires = self._get_user_reported_fires(region, window)
                 fires.extend(user_fires)
             
             # TODO: Add VIIRS support when available
-            # if sources.get("VIIRS", False):
+            # if sources & SourceMask.VIIRS:
             #     viirs_fires = self.api_service.get_viirs_fires(region, date_range)
             #     for fire_data in viirs_fires:
             #         fire_db = self._save_fire_to_db(fire_data)
@@ -81,7 +230,35 @@ class FireService:
         
         return fires
     
-    def _get_custom_date_fires(self, region: str, start_date: str, end_date: str, sources: dict) -> List[FireDetectionResponse]:
+    @classmethod
+    def ingest_recent_fires(cls, region: str, date_range: str, sources: int):
+        """Fetch recent MODIS fires from the API and store any new ones"""
+        if not sources & SourceMask.MODIS:
+            return
+        
+        try:
+            if date_range == "24hr":
+                api_fires = cls.api_service.get_24hr_fires(region)
+            else:  # 7day
+                api_fires = cls.api_service.get_7day_fires(region)
+            
+            # Save to database; ingest uses its own writer session so the
+            # caller's session can stay read-only
+            epochs = []
+            with SessionManager() as write_db:
+                for fire_data in api_fires:
+                    fire_db = cls._save_fire_to_db(write_db, fire_data)
+                    if fire_db is not None:
+                        epochs.append(fire_db.acq_epoch)
+            
+            # Reads of this window cover the whole batch, however old its oldest row
+            if epochs:
+                _feed_start_epochs[(region, date_range)] = min(epochs)
+        
+        except Exception as e:
+            print(f"Error ingesting recent fires: {e}")
+    
+    def _get_custom_date_fires(self, region: str, start_date: str, end_date: str, sources: int) -> List[FireDetectionResponse]:
         """Get fires from historical database for custom date range"""
         try:
             # Use historical fire service for custom date ranges
@@ -96,14 +273,65 @@ class FireService:
             print(f"Error fetching custom date fires: {e}")
             return []
     
-    def _save_fire_to_db(self, fire_data: FireDetectionCreate) -> Optional[FireDetection]:
+    def _get_stored_fires(self, region: str, window: dict, source_mask: int) -> List[FireDetectionResponse]:
+        """Get stored fires for the masked sources within the recent window and region bounds"""
+        stmt = _stored_fires_stmt(region)
+        params = {"source_mask": int(source_mask), **window}
+        
+        fires = []
+        for batch in self.db.execute(stmt, params).scalars().partitions():
+            fires.extend(self._convert_to_response(fire_db) for fire_db in batch)
+        return fires
+    
+    def get_fires_as_columns(self,
+                             region: str = "all-northern-india",
+                             date_range: str = "24hr",
+                             custom_start_date: Optional[str] = None,
+                             custom_end_date: Optional[str] = None,
+                             sources: int = SourceMask.MODIS | SourceMask.VIIRS,
+                             ingest: bool = True,
+                             end_epoch: Optional[int] = None) -> dict:
+        """Get fires as one array per field instead of one response object per fire"""
+        rows = []
+        
+        try:
+            if date_range in RECENT_WINDOWS:
+                if ingest:
+                    self.ingest_recent_fires(region, date_range, sources)
+                window = _window_params(region, date_range, end_epoch)
+                
+                # Stored satellite fires are read straight into tuples, skipping the ORM objects
+                satellite_mask = sources & (SourceMask.MODIS | SourceMask.VIIRS)
+                if satellite_mask:
+                    params = {"source_mask": int(satellite_mask), **window}
+                    rows.extend(self.db.execute(_stored_columns_stmt(region), params).all())
+                
+                if sources & SourceMask.USER:
+                    rows.extend(_response_row(fire) for fire in self._get_user_reported_fires(region, window))
+            else:
+                fires = self.get_fires_by_filters(
+                    region=region,
+                    date_range=date_range,
+                    custom_start_date=custom_start_date,
+                    custom_end_date=custom_end_date,
+                    sources=sources
+                )
+                rows.extend(_response_row(fire) for fire in fires)
+        
+        except Exception as e:
+            print(f"Error fetching fire columns: {e}")
+        
+        return _rows_to_columns(rows)
+    
+    @staticmethod
+    def _save_fire_to_db(db: Session, fire_data: FireDetectionCreate) -> Optional[FireDetection]:
         """Save fire data to database"""
         try:
             # Generate unique ID
             fire_id = f"{fire_data.source}_{fire_data.latitude:.4f}_{fire_data.longitude:.4f}_{fire_data.acq_date}_{fire_data.acq_time}"
             
             # Check if fire already exists
-            existing_fire = self.db.query(FireDetection).filter(FireDetection.id == fire_id).first()
+            existing_fire = db.query(FireDetection).filter(FireDetection.id == fire_id).first()
             if existing_fire:
                 return existing_fire
             
@@ -111,9 +339,10 @@ class FireService:
             try:
                 acq_datetime = datetime.strptime(f"{fire_data.acq_date} {fire_data.acq_time.zfill(4)}", "%Y-%m-%d %H%M")
             except:
-                acq_datetime = datetime.now()
+                # Stay in UTC like the parsed times, or acq_epoch shifts by the server offset
+                acq_datetime = datetime.utcnow()
             
-            # Create new fire record
+            # Create new fire record; FIRMS acquisition times are UTC
             fire_db = FireDetection(
                 id=fire_id,
                 latitude=fire_data.latitude,
@@ -123,7 +352,9 @@ class FireService:
                 acq_date=fire_data.acq_date,
                 acq_time=fire_data.acq_time,
                 acq_datetime=acq_datetime,
+                acq_epoch=calendar.timegm(acq_datetime.timetuple()),
                 source=fire_data.source,
+                source_id=int(SOURCE_IDS.get(fire_data.source, 0)),
                 frp=fire_data.frp,
                 scan=fire_data.scan,
                 track=fire_data.track,
@@ -131,15 +362,15 @@ class FireService:
                 district=fire_data.district
             )
             
-            self.db.add(fire_db)
-            self.db.commit()
-            self.db.refresh(fire_db)
+            db.add(fire_db)
+            db.commit()
+            db.refresh(fire_db)
             
             return fire_db
             
         except Exception as e:
             print(f"Error saving fire to database: {e}")
-            self.db.rollback()
+            db.rollback()
             return None
     
     def _convert_to_response(self, fire_db: FireDetection) -> FireDetectionResponse:
@@ -162,7 +393,8 @@ class FireService:
             created_at=fire_db.created_at
         )
     
-    def get_fire_statistics(self, fires: List[FireDetectionResponse]) -> dict:
+    @staticmethod
+    def get_fire_statistics(fires: List[FireDetectionResponse]) -> dict:
         """Calculate statistics for fire data"""
         if not fires:
             return {
@@ -199,6 +431,70 @@ class FireService:
             "states": states
         }
     
+    @staticmethod
+    def get_column_statistics(columns: dict) -> dict:
+        """Calculate fire statistics from the columnar layout with vectorized reductions"""
+        confidence = columns["confidence"]
+        total_fires = len(confidence)
+        if not total_fires:
+            return FireService.get_fire_statistics([])
+        
+        return {
+            "total_fires": total_fires,
+            "high_confidence_fires": int(np.count_nonzero(confidence >= 80)),
+            "average_confidence": round(float(confidence.mean()), 1),
+            "total_fire_power": round(float(np.nansum(columns["frp"], dtype=np.float64)), 1),
+            "sources": dict(Counter(columns["source"])),
+            "states": dict(Counter(state for state in columns["state"] if state))
+        }
+    
+    def get_fire_statistics_sql(self, region: str, date_range: str, sources: int, ingest: bool = True,
+                                end_epoch: Optional[int] = None) -> dict:
+        """Calculate fire statistics with a SQL aggregate instead of loading every fire"""
+        if date_range not in RECENT_WINDOWS:
+            return self.get_fire_statistics(self.get_fires_by_filters(region=region, date_range=date_range, sources=sources))
+        
+        # Rows of (source, state, count, high confidence count, confidence sum, fire power sum)
+        groups = []
+        
+        try:
+            if ingest:
+                self.ingest_recent_fires(region, date_range, sources)
+            window = _window_params(region, date_range, end_epoch)
+            
+            satellite_mask = sources & (SourceMask.MODIS | SourceMask.VIIRS)
+            if satellite_mask:
+                params = {"source_mask": int(satellite_mask), **window}
+                groups.extend(self.db.execute(_stored_statistics_stmt(region), params).all())
+            
+            # User reports are few and derive their values in Python
+            if sources & SourceMask.USER:
+                for fire in self._get_user_reported_fires(region, window):
+                    groups.append((fire.source, fire.state, 1, int(fire.confidence >= 80), fire.confidence, fire.frp or 0.0))
+        
+        except Exception as e:
+            print(f"Error calculating fire statistics: {e}")
+        
+        total_fires = sum(group[2] for group in groups)
+        if not total_fires:
+            return self.get_fire_statistics([])
+        
+        sources_count = {}
+        states = {}
+        for source, state, count, _, _, _ in groups:
+            sources_count[source] = sources_count.get(source, 0) + count
+            if state:
+                states[state] = states.get(state, 0) + count
+        
+        return {
+            "total_fires": total_fires,
+            "high_confidence_fires": sum(group[3] for group in groups),
+            "average_confidence": round(sum(group[4] for group in groups) / total_fires, 1),
+            "total_fire_power": round(sum(group[5] for group in groups), 1),
+            "sources": sources_count,
+            "states": states
+        }
+    
     def create_user_report(self, report_data: UserReportedFireCreate) -> UserReportedFireResponse:
         """Create a new user-reported fire incident"""
         try:
@@ -222,7 +518,10 @@ class FireService:
                 district=report_data.district,
                 estimated_area=report_data.estimated_area,
                 smoke_visibility=report_data.smoke_visibility,
-                fire_type=report_data.fire_type
+                fire_type=report_data.fire_type,
+                # Set here rather than left to the server default so the UTC
+                # convention the time windows and epochs rely on is explicit
+                reported_at=datetime.utcnow()
             )
             
             self.db.add(user_report)
@@ -239,23 +538,14 @@ class FireService:
     def get_user_reports(self, region: str = "all-northern-india", status_filter: str = "all", limit: int = 100) -> List[UserReportedFireResponse]:
         """Get user-reported fire incidents"""
         try:
-            query = self.db.query(UserReportedFire)
-            
-            # Filter by status
+            params = {"limit": limit}
             if status_filter != "all":
-                query = query.filter(UserReportedFire.status == status_filter)
+                params["status_filter"] = status_filter
             
-            # Filter by region if not all-northern-india
-            if region != "all-northern-india":
-                # Add region filtering based on coordinates or state
-                if region in ['punjab', 'haryana', 'uttar-pradesh', 'delhi', 'rajasthan', 'himachal-pradesh', 'uttarakhand']:
-                    query = query.filter(UserReportedFire.state == region)
-            
-            # Order by most recent first
-            query = query.order_by(UserReportedFire.reported_at.desc())
-            
-            # Apply limit
-            reports = query.limit(limit).all()
+            # Newest first, filtered by status and by state for single-state regions
+            state = region if region in STATE_REGION_KEYS else None
+            stmt = _user_reports_stmt(state, status_filter != "all")
+            reports = self.db.execute(stmt, params).scalars().all()
             
             return [self._convert_user_report_to_response(report) for report in reports]
             
@@ -285,43 +575,35 @@ class FireService:
             self.db.rollback()
             return None
     
-    def _get_user_reported_fires(self, region: str, date_range: str) -> List[FireDetectionResponse]:
+    def _get_user_reported_fires(self, region: str, window: dict) -> List[FireDetectionResponse]:
         """Get user-reported fires in the format compatible with regular fire detection"""
         try:
-            query = self.db.query(UserReportedFire)
-            
-            # Filter by date range
-            if date_range == "24hr":
-                since_date = datetime.now() - timedelta(hours=24)
-                query = query.filter(UserReportedFire.reported_at >= since_date)
-            elif date_range == "7day":
-                since_date = datetime.now() - timedelta(days=7)
-                query = query.filter(UserReportedFire.reported_at >= since_date)
+            # Filter by the same window as the stored fires; reported_at is
+            # stored as naive UTC (SQLite CURRENT_TIMESTAMP)
+            params = {
+                "since_date": datetime.utcfromtimestamp(window["start_epoch"]),
+                "until_date": datetime.utcfromtimestamp(window["end_epoch"])
+            }
             
             # Filter by region
-            if region != "all-northern-india":
-                if region in ['punjab', 'haryana', 'uttar-pradesh', 'delhi', 'rajasthan', 'himachal-pradesh', 'uttarakhand']:
-                    query = query.filter(UserReportedFire.state == region)
-            
-            user_reports = query.all()
+            state = region if region in STATE_REGION_KEYS else None
+            stmt = _user_reported_fires_stmt(state)
+            user_reports = self.db.execute(stmt, params).scalars().all()
             
             # Convert to FireDetectionResponse format
             converted_fires = []
             for report in user_reports:
                 # Convert severity to confidence score
-                confidence_map = {"Low": 25, "Medium": 50, "High": 75, "Critical": 95}
-                confidence = confidence_map.get(report.severity, 50)
+                confidence = SEVERITY_CONFIDENCE.get(report.severity, 50)
                 
                 # Estimate brightness based on severity
-                brightness_map = {"Low": 300, "Medium": 320, "High": 350, "Critical": 400}
-                brightness = brightness_map.get(report.severity, 320)
+                brightness = SEVERITY_BRIGHTNESS.get(report.severity, 320)
                 
                 # Estimate FRP based on area and severity
                 frp = 0
                 if report.estimated_area:
                     base_frp = report.estimated_area * 2  # 2 MW per hectare base
-                    severity_multiplier = {"Low": 1, "Medium": 1.5, "High": 2, "Critical": 3}
-                    frp = base_frp * severity_multiplier.get(report.severity, 1)
+                    frp = base_frp * SEVERITY_FRP_MULTIPLIER.get(report.severity, 1)
                 
                 fire_response = FireDetectionResponse(
                     id=report.id,
@@ -373,19 +655,4 @@ class FireService:
     
     def _get_state_from_coordinates(self, lat: float, lon: float) -> Optional[str]:
         """Simple state detection based on coordinates"""
-        state_bounds = {
-            'punjab': {'min_lat': 29.5, 'max_lat': 32.5, 'min_lon': 73.5, 'max_lon': 76.5},
-            'haryana': {'min_lat': 27.5, 'max_lat': 30.9, 'min_lon': 74.0, 'max_lon': 77.5},
-            'uttar-pradesh': {'min_lat': 23.8, 'max_lat': 30.4, 'min_lon': 77.0, 'max_lon': 84.6},
-            'delhi': {'min_lat': 28.4, 'max_lat': 28.9, 'min_lon': 76.8, 'max_lon': 77.3},
-            'rajasthan': {'min_lat': 23.0, 'max_lat': 30.2, 'min_lon': 69.5, 'max_lon': 78.3},
-            'himachal-pradesh': {'min_lat': 30.2, 'max_lat': 33.2, 'min_lon': 75.5, 'max_lon': 79.0},
-            'uttarakhand': {'min_lat': 28.4, 'max_lat': 31.5, 'min_lon': 77.5, 'max_lon': 81.1}
-        }
-        
-        for state, bounds in state_bounds.items():
-            if (bounds['min_lat'] <= lat <= bounds['max_lat'] and 
-                bounds['min_lon'] <= lon <= bounds['max_lon']):
-                return state
-        
-        return None
\ No newline at end of file
+        return get_state_from_coordinates(lat, lon)
@@ -2,7 +2,7 @@ import sqlite3
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Optional
-from app.models.fire import FireDetectionCreate, FireDetectionResponse
+from app.models.fire import SourceMask, FireDetectionCreate, FireDetectionResponse
 from app.utils.regions import get_region_bounds
 
 class HistoricalFireService:
@@ -13,7 +13,7 @@ class HistoricalFireService:
                                start_date: str, 
                                end_date: str,
                                region: str = "all-northern-india",
-                               sources: dict = None) -> List[FireDetectionResponse]:
+                               sources: int = None) -> List[FireDetectionResponse]:
         """
         Get fires from historical database for custom date range
         
@@ -21,13 +21,13 @@ class HistoricalFireService:
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
             region: Region to filter by
-            sources: Dictionary of enabled sources
+            sources: SourceMask bits of enabled sources
             
         Returns:
             List of FireDetectionResponse objects
         """
         if sources is None:
-            sources = {"MODIS": True, "VIIRS": True, "User Reported": False}
+            sources = SourceMask.MODIS | SourceMask.VIIRS
         
         try:
             # Validate date range (max 31 days)
@@ -38,7 +38,7 @@ class HistoricalFireService:
                 raise ValueError("Date range cannot exceed 31 days")
             
             # Connect to database
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
             
             # Build query
             query = """
@@ -92,9 +92,9 @@ class HistoricalFireService:
             
             # Filter by sources
             enabled_sources = []
-            if sources.get("VIIRS", False):
+            if sources & SourceMask.VIIRS:
                 enabled_sources.append("VIIRS")
-            if sources.get("MODIS", False):
+            if sources & SourceMask.MODIS:
                 enabled_sources.append("MODIS")
             
             if enabled_sources:
@@ -170,14 +170,14 @@ class HistoricalFireService:
     def get_available_date_range(self) -> dict:
         """Get the available date range in the historical database"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
             query = "SELECT MIN(acq_date) as min_date, MAX(acq_date) as max_date FROM fires"
-            result = pd.read_sql_query(query, conn)
+            min_date, max_date = conn.execute(query).fetchone()
             conn.close()
             
             return {
-                "min_date": result['min_date'].iloc[0],
-                "max_date": result['max_date'].iloc[0]
+                "min_date": min_date,
+                "max_date": max_date
             }
         except Exception as e:
             print(f"Error getting date range: {e}")
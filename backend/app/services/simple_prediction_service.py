@@ -20,6 +20,18 @@ class SimplePredictionService:
                            custom_end_date: str = None,
                            confidence_threshold: float = 70.0) -> List[PredictionData]:
         """Generate fire predictions based on historical patterns"""
+        predictions, _ = self.generate_predictions_with_count(
+            region, date_range, custom_start_date, custom_end_date, confidence_threshold
+        )
+        return predictions
+    
+    def generate_predictions_with_count(self, 
+                                        region: str = "all-northern-india",
+                                        date_range: str = "next-7days",
+                                        custom_start_date: str = None,
+                                        custom_end_date: str = None,
+                                        confidence_threshold: float = 70.0) -> Tuple[List[PredictionData], int]:
+        """Generate fire predictions and count those at or above the confidence threshold"""
         
         try:
             print(f"Starting prediction generation for {region}...")
@@ -34,7 +46,7 @@ class SimplePredictionService:
             
             if historical_data.empty:
                 print("No historical data found for region")
-                return []
+                return [], 0
             
             # Analyze patterns
             fire_patterns = self._analyze_fire_patterns(historical_data)
@@ -78,17 +90,18 @@ class SimplePredictionService:
             limited_predictions.sort(key=lambda x: (x.confidence, x.probability), reverse=True)
             limited_predictions = limited_predictions[:80]
             
-            # Count predictions by confidence level for logging
-            high_conf_count = len([p for p in limited_predictions if p.confidence >= confidence_threshold])
-            med_conf_count = len([p for p in limited_predictions if 50 <= p.confidence < confidence_threshold])
-            low_conf_count = len([p for p in limited_predictions if p.confidence < 50])
+            # Count predictions by confidence level in one pass over a confidence array
+            confidences = np.fromiter((p.confidence for p in limited_predictions), dtype=float, count=len(limited_predictions))
+            high_conf_count = int(np.count_nonzero(confidences >= confidence_threshold))
+            low_conf_count = int(np.count_nonzero(confidences < 50))
+            med_conf_count = int(np.count_nonzero((confidences >= 50) & (confidences < confidence_threshold)))
             
             print(f"Generated {len(limited_predictions)} total predictions: {high_conf_count} high confidence ({confidence_threshold}%+), {med_conf_count} medium confidence (50-{confidence_threshold-1}%), {low_conf_count} low confidence (<50%)")
-            return limited_predictions
+            return limited_predictions, high_conf_count
             
         except Exception as e:
             print(f"Error generating predictions: {e}")
-            return []
+            return [], 0
     
     def _load_historical_data(self, region: str) -> pd.DataFrame:
         """Load historical fire data for the region"""
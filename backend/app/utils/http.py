@@ -0,0 +1,36 @@
+from fastapi import Request
+from fastapi.responses import Response
+import hashlib
+import orjson
+
+class StaticJSON:
+    """JSON body serialized once, served with an ETag and Cache-Control"""
+    
+    def __init__(self, content, max_age: int = 3600):
+        self.body = orjson.dumps(content)
+        self.etag = f'"{hashlib.md5(self.body).hexdigest()}"'
+        self.headers = {
+            "Cache-Control": f"public, max-age={max_age}",
+            "ETag": self.etag
+        }
+    
+    def response(self, request: Request) -> Response:
+        """Return the body, or 304 Not Modified if the client already has it"""
+        if self._matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
+    
+    def _matches(self, if_none_match) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # Weak validators compare equal for GET per RFC 9110
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag == self.etag:
+                return True
+        return False
+    
\ No newline at end of file
@@ -1,4 +1,81 @@
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+import numpy as np
+
+# Bounding boxes are built once at import rather than on every lookup
+REGION_BOUNDS = {
+    'all-northern-india': {
+        'min_lat': 23.5, 'max_lat': 32.0,
+        'min_lon': 73.0, 'max_lon': 84.5
+    },
+    'punjab': {
+        'min_lat': 29.5, 'max_lat': 32.5,
+        'min_lon': 73.5, 'max_lon': 76.5
+    },
+    'haryana': {
+        'min_lat': 27.5, 'max_lat': 30.9,
+        'min_lon': 74.0, 'max_lon': 77.5
+    },
+    'uttar-pradesh': {
+        'min_lat': 23.8, 'max_lat': 30.4,
+        'min_lon': 77.0, 'max_lon': 84.6
+    },
+    'delhi': {
+        'min_lat': 28.4, 'max_lat': 28.9,
+        'min_lon': 76.8, 'max_lon': 77.3
+    },
+    'rajasthan': {
+        'min_lat': 23.0, 'max_lat': 30.2,
+        'min_lon': 69.5, 'max_lon': 78.3
+    },
+    'himachal-pradesh': {
+        'min_lat': 30.2, 'max_lat': 33.2,
+        'min_lon': 75.5, 'max_lon': 79.0
+    },
+    'uttarakhand': {
+        'min_lat': 28.4, 'max_lat': 31.5,
+        'min_lon': 77.5, 'max_lon': 81.1
+    },
+    # City areas
+    'chandigarh': {
+        'min_lat': 30.6, 'max_lat': 30.8,
+        'min_lon': 76.6, 'max_lon': 76.9
+    },
+    'amritsar': {
+        'min_lat': 31.5, 'max_lat': 31.8,
+        'min_lon': 74.7, 'max_lon': 75.0
+    },
+    'ludhiana': {
+        'min_lat': 30.8, 'max_lat': 31.0,
+        'min_lon': 75.7, 'max_lon': 76.0
+    },
+    'gurgaon': {
+        'min_lat': 28.3, 'max_lat': 28.6,
+        'min_lon': 76.8, 'max_lon': 77.2
+    }
+}
+
+# States checked, in order, when tagging a detection with its state
+STATE_REGIONS = ('punjab', 'haryana', 'uttar-pradesh', 'delhi', 'rajasthan', 'himachal-pradesh', 'uttarakhand')
+STATE_BOUNDS = tuple((state, REGION_BOUNDS[state]) for state in STATE_REGIONS)
+
+def pack_region_bounds(regions: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pack region bounding boxes into (lower, upper, names) arrays for batched lookups"""
+    lower = np.array([[REGION_BOUNDS[r]['min_lat'], REGION_BOUNDS[r]['min_lon']] for r in regions])
+    upper = np.array([[REGION_BOUNDS[r]['max_lat'], REGION_BOUNDS[r]['max_lon']] for r in regions])
+    return lower, upper, np.array(regions, dtype=object)
+
+def classify_regions(lats: Iterable[float], lons: Iterable[float], packed: Tuple[np.ndarray, np.ndarray, np.ndarray], default=None) -> np.ndarray:
+    """Return the first packed region containing each point, or default"""
+    lower, upper, names = packed
+    lats = np.asarray(lats, dtype=float)[:, None]
+    lons = np.asarray(lons, dtype=float)[:, None]
+    inside = (
+        (lats >= lower[:, 0]) & (lats <= upper[:, 0]) &
+        (lons >= lower[:, 1]) & (lons <= upper[:, 1])
+    )
+    return np.where(inside.any(axis=1), names[inside.argmax(axis=1)], default)
+
+STATE_ARRAYS = pack_region_bounds(STATE_REGIONS)
 
 def get_region_bounds(region: str) -> Optional[Dict[str, float]]:
     """
@@ -10,59 +87,7 @@ def get_region_bounds(region: str) -> Optional[Dict[str, float]]:
     Returns:
         Dictionary with min/max lat/lon bounds or None if region not found
     """
-    region_bounds = {
-        'all-northern-india': {
-            'min_lat': 23.5, 'max_lat': 32.0,
-            'min_lon': 73.0, 'max_lon': 84.5
-        },
-        'punjab': {
-            'min_lat': 29.5, 'max_lat': 32.5,
-            'min_lon': 73.5, 'max_lon': 76.5
-        },
-        'haryana': {
-            'min_lat': 27.5, 'max_lat': 30.9,
-            'min_lon': 74.0, 'max_lon': 77.5
-        },
-        'uttar-pradesh': {
-            'min_lat': 23.8, 'max_lat': 30.4,
-            'min_lon': 77.0, 'max_lon': 84.6
-        },
-        'delhi': {
-            'min_lat': 28.4, 'max_lat': 28.9,
-            'min_lon': 76.8, 'max_lon': 77.3
-        },
-        'rajasthan': {
-            'min_lat': 23.0, 'max_lat': 30.2,
-            'min_lon': 69.5, 'max_lon': 78.3
-        },
-        'himachal-pradesh': {
-            'min_lat': 30.2, 'max_lat': 33.2,
-            'min_lon': 75.5, 'max_lon': 79.0
-        },
-        'uttarakhand': {
-            'min_lat': 28.4, 'max_lat': 31.5,
-            'min_lon': 77.5, 'max_lon': 81.1
-        },
-        # City areas
-        'chandigarh': {
-            'min_lat': 30.6, 'max_lat': 30.8,
-            'min_lon': 76.6, 'max_lon': 76.9
-        },
-        'amritsar': {
-            'min_lat': 31.5, 'max_lat': 31.8,
-            'min_lon': 74.7, 'max_lon': 75.0
-        },
-        'ludhiana': {
-            'min_lat': 30.8, 'max_lat': 31.0,
-            'min_lon': 75.7, 'max_lon': 76.0
-        },
-        'gurgaon': {
-            'min_lat': 28.3, 'max_lat': 28.6,
-            'min_lon': 76.8, 'max_lon': 77.2
-        }
-    }
-    
-    return region_bounds.get(region)
+    return REGION_BOUNDS.get(region)
 
 def is_point_in_region(lat: float, lon: float, region: str) -> bool:
     """
@@ -122,4 +147,35 @@ def get_available_regions() -> Dict[str, str]:
         'amritsar': 'Amritsar Area',
         'ludhiana': 'Ludhiana Area',
         'gurgaon': 'Gurgaon Area'
-    }
\ No newline at end of file
+    }
+
+def get_state_from_coordinates(lat: float, lon: float) -> Optional[str]:
+    """
+    Simple state detection based on coordinate ranges
+    
+    Args:
+        lat: Latitude
+        lon: Longitude
+        
+    Returns:
+        First state whose bounding box contains the point, or None
+    """
+    for state, bounds in STATE_BOUNDS:
+        if (bounds['min_lat'] <= lat <= bounds['max_lat'] and 
+            bounds['min_lon'] <= lon <= bounds['max_lon']):
+            return state
+    
+    return None
+
+def get_states_from_coordinates(lats: Iterable[float], lons: Iterable[float]) -> np.ndarray:
+    """
+    Batched get_state_from_coordinates over arrays of points
+    
+    Args:
+        lats: Latitudes
+        lons: Longitudes
+        
+    Returns:
+        Object array of state identifiers, None where no state matches
+    """
+    return classify_regions(lats, lons, STATE_ARRAYS)
@@ -15,5 +15,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
+        loop="auto",
+        http="httptools",
         log_level="info"
     )
\ No newline at end of file
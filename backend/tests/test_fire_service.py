@@ -0,0 +1,72 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import calendar
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database.connection import Base
+from app.models import fire, prediction
+from app.models.fire import SourceMask, FireDetectionCreate
+from app.services import fire_service
+from app.services.fire_service import FireService
+
+NOW = datetime(2024, 10, 15, 12, 0)
+END_EPOCH = calendar.timegm(NOW.timetuple())
+
+def _feed_row(index: int, hours_ago: int) -> FireDetectionCreate:
+    acquired = NOW - timedelta(hours=hours_ago)
+    return FireDetectionCreate(
+        latitude=30.0 + index * 0.01,
+        longitude=75.0,
+        brightness=320.0,
+        confidence=80,
+        acq_date=acquired.strftime("%Y-%m-%d"),
+        acq_time=acquired.strftime("%H%M"),
+        source="MODIS",
+        frp=10.0,
+        state="punjab"
+    )
+
+# A FIRMS 24-hour feed: 40 detections inside the nominal window and 7 from
+# 25-31 hours ago, which the feed routinely includes
+FIXTURE_FEED = (
+    [_feed_row(index, index % 24) for index in range(40)] +
+    [_feed_row(40 + index, 25 + index) for index in range(7)]
+)
+
+@pytest.fixture
+def db(monkeypatch):
+    """In-memory database serving the fixture feed instead of FIRMS"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    @contextmanager
+    def session_manager(read_only: bool = False):
+        yield session
+
+    monkeypatch.setattr(fire_service, "SessionManager", session_manager)
+    monkeypatch.setattr(fire_service, "_feed_start_epochs", {})
+    monkeypatch.setattr(FireService.api_service, "get_24hr_fires", lambda region: FIXTURE_FEED)
+    yield session
+    session.close()
+
+def test_recent_fires_include_whole_feed(db):
+    fires = FireService(db).get_fires_by_filters(
+        region="punjab", date_range="24hr", sources=SourceMask.MODIS, end_epoch=END_EPOCH
+    )
+    assert len(fires) == 47
+
+def test_recent_columns_after_separate_ingest(db):
+    FireService.ingest_recent_fires("punjab", "24hr", SourceMask.MODIS)
+    columns = FireService(db).get_fires_as_columns(
+        region="punjab", date_range="24hr", sources=SourceMask.MODIS, ingest=False, end_epoch=END_EPOCH
+    )
+    assert len(columns["id"]) == 47
+
+def test_recent_statistics_include_whole_feed(db):
+    statistics = FireService(db).get_fire_statistics_sql("punjab", "24hr", SourceMask.MODIS, end_epoch=END_EPOCH)
+    assert statistics["total_fires"] == 47